@@ -27,19 +27,23 @@ interface ReliabilityResponse {
     fps_used: number
     roi: [number, number, number, number]
     roi_source?: 'AUTO' | 'USER' // Whether ROI was auto-generated or user-drawn
+    box_pack_bits?: number // Bits per coordinate in all_frames person_boxes_packed
   }
-  overlay_image?: string // base64 PNG with ROI + boxes drawn
+  overlay_image?: string // base64 JPEG with ROI + boxes drawn
   overlay_image_base64?: string // Alternative field name for overlay image
-  alert_frame?: string // base64 PNG of frame at flip_at_s
+  alert_frame?: string // base64 JPEG of frame at flip_at_s
+  overlay_image_url?: string // URL of JPEG with ROI + boxes drawn (served via /api/frame/[id])
+  alert_frame_url?: string // URL of JPEG of frame at flip_at_s (served via /api/frame/[id])
   frame_data?: {
     // Frame at flip_at_s for thumbnail
     timestamp: number
-    person_boxes: Array<{ x1: number; y1: number; x2: number; y2: number }>
+    person_boxes?: Array<{ x1: number; y1: number; x2: number; y2: number }> // Local fallback only; backend boxes are in all_frames
   }
   all_frames?: Array<{
     // All frames with person boxes for overlay
     timestamp: number
-    person_boxes: Array<{ x1: number; y1: number; x2: number; y2: number }>
+    person_boxes?: Array<{ x1: number; y1: number; x2: number; y2: number }>
+    person_boxes_packed?: number[] // Backend: one integer per box (see ReliabilityResults unpackBoxes)
     occlusion_pct: number
   }>
 }
@@ -47,6 +51,21 @@ interface ReliabilityResponse {
 // Default Region of Interest (full screen) - [x1, y1, x2, y2] as percentage
 const DEFAULT_ROI: [number, number, number, number] = [0, 0, 1, 1]
 
+// The backend returns overlay/alert JPEGs as /frame/{id} paths instead of inline base64.
+// The browser loads them through /api/frame/[id] since the backend URL is server-side only.
+function toProxyFrameUrl(backendPath?: string): string | undefined {
+  if (!backendPath) return undefined
+  return `/api/frame/${backendPath.split('/').pop()}`
+}
+
+// Base64 of a backend frame, for the Grok request which needs an inline data URL
+async function fetchFrameBase64(backendUrl: string, backendPath?: string): Promise<string | undefined> {
+  if (!backendPath) return undefined
+  const frameResponse = await fetch(`${backendUrl}${backendPath}`)
+  if (!frameResponse.ok) return undefined
+  return Buffer.from(await frameResponse.arrayBuffer()).toString('base64')
+}
+
 export async function POST(request: NextRequest) {
   const startTime = Date.now()
   console.log('[Reliability API] Request started at', new Date().toISOString())
@@ -116,8 +135,8 @@ export async function POST(request: NextRequest) {
           const elapsed = Date.now() - startTime
           console.log(`[Reliability API] Backend processing completed in ${elapsed}ms`)
           console.log('[Reliability API] Backend response keys:', Object.keys(data))
-        console.log('[Reliability API] Has overlay_image:', !!data.overlay_image)
-        console.log('[Reliability API] Has alert_frame:', !!data.alert_frame)
+        console.log('[Reliability API] Has overlay_image:', !!(data.overlay_image || data.overlay_image_url))
+        console.log('[Reliability API] Has alert_frame:', !!(data.alert_frame || data.alert_frame_url))
         
         // Track ROI source (USER if ROI was provided, AUTO otherwise)
         if (!data.debug) {
@@ -134,7 +153,8 @@ export async function POST(request: NextRequest) {
             console.log('[Reliability API] Attempting Grok AI enhancement with backend data...')
             
             // Use alert_frame if available (most relevant), otherwise overlay_image, otherwise metrics-only
-            const frameToAnalyze = data.alert_frame || data.overlay_image
+            const frameToAnalyze = data.alert_frame || data.overlay_image ||
+              await fetchFrameBase64(backendUrl, data.alert_frame_url || data.overlay_image_url)
             const hasFrame = !!frameToAnalyze
             
             const grokPrompt = hasFrame
@@ -178,7 +198,7 @@ Then provide a SPECIFIC camera placement recommendation based on the occlusion p
                         {
                           type: 'image_url',
                           image_url: {
-                            url: `data:image/png;base64,${frameToAnalyze}`,
+                            url: `data:image/jpeg;base64,${frameToAnalyze}`,
                           },
                         },
                       ]
@@ -307,6 +327,10 @@ Then provide a SPECIFIC camera placement recommendation based on the occlusion p
           data.overlay_image_base64 = data.overlay_image
         }
         
+        // Point frame URLs at the proxy route
+        data.overlay_image_url = toProxyFrameUrl(data.overlay_image_url)
+        data.alert_frame_url = toProxyFrameUrl(data.alert_frame_url)
+        
         // Add roi_source if not present (for backend responses)
         if (!data.debug.roi_source) {
           data.debug.roi_source = 'AUTO' // Default to AUTO if not specified
@@ -804,12 +828,12 @@ Then provide a SPECIFIC camera placement recommendation based on the occlusion p
       }
 
       // Store frame data for overlay rendering (frontend will draw)
-      // In production: use opencv-python to generate base64 PNG with ROI + boxes
-      const overlayImage = undefined // base64 PNG (would be generated server-side)
+      // In production: use opencv-python to generate base64 JPEG with ROI + boxes
+      const overlayImage = undefined // base64 JPEG (would be generated server-side)
       
       // Store alert frame data for thumbnail rendering
       // Frontend will use this to show the frame at flip_at_s
-      const alertFrame = undefined // base64 PNG (would be extracted at flip_at_s)
+      const alertFrame = undefined // base64 JPEG (would be extracted at flip_at_s)
       
       // Prepare frame data for frontend
       let frameDataForResponse: { timestamp: number; person_boxes: Array<{ x1: number; y1: number; x2: number; y2: number }> } | undefined = undefined
@@ -0,0 +1,43 @@
+import { NextRequest, NextResponse } from 'next/server'
+
+export const runtime = 'nodejs'
+
+// Proxies overlay/alert JPEGs from the backend's /frame/{id} route; the backend URL
+// is server-side only, so the browser loads them through here
+export async function GET(
+  request: NextRequest,
+  { params }: { params: { id: string } }
+) {
+  const backendUrl = process.env.ANALYSIS_BACKEND_URL
+
+  if (!backendUrl) {
+    return NextResponse.json(
+      { error: 'Backend not configured' },
+      { status: 503 }
+    )
+  }
+
+  try {
+    const backendResponse = await fetch(`${backendUrl}/frame/${encodeURIComponent(params.id)}`)
+
+    if (!backendResponse.ok) {
+      return NextResponse.json(
+        { error: 'Frame not found or expired' },
+        { status: backendResponse.status }
+      )
+    }
+
+    return new NextResponse(backendResponse.body, {
+      headers: {
+        'Content-Type': backendResponse.headers.get('Content-Type') || 'image/jpeg',
+        'Cache-Control': backendResponse.headers.get('Cache-Control') || 'private, max-age=600',
+      },
+    })
+  } catch (error) {
+    console.error('[Frame API] Error:', error)
+    return NextResponse.json(
+      { error: 'Failed to fetch frame from backend' },
+      { status: 502 }
+    )
+  }
+}
@@ -1,6 +1,6 @@
-from fastapi import FastAPI, File, UploadFile, Form
+from fastapi import FastAPI, File, UploadFile, Form, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, Response, StreamingResponse
 import os
 import sys
 
@@ -84,15 +84,30 @@ except Exception as e:
     raise
 
 import numpy as np
+import asyncio
 import base64
 import tempfile
 import os
 from pathlib import Path
 from typing import Optional, List, Tuple, Dict
+from dataclasses import replace
 import json
 import subprocess
+import shutil
+import threading
 import time
+import uuid
+import io
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 import requests
+import orjson
+
+try:
+    from PIL import Image
+except ImportError:
+    Image = None
 
 # Fix PyTorch 2.6 YOLO loading issue - MUST be before YOLO import
 try:
@@ -105,7 +120,7 @@ try:
         return _original_load(*args, **kwargs)
     torch.load = _patched_load
 except ImportError:
-    pass
+    torch = None
 
 # Now import YOLO (after patching torch.load)
 # Import YOLO lazily to avoid startup issues
@@ -118,8 +133,16 @@ except ImportError as e:
 # Import extracted modules
 from modules.motion_detector import MotionDetector
 from modules.coverage_metrics import CoverageMetrics, calculate_coverage_score
+from modules import result_cache
+
+ORJSON_OPTIONS = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
 
-app = FastAPI(title="XAnalyzer Reliability Backend")
+class ORJSONResponse(JSONResponse):
+    """JSON response rendered by orjson; NumPy arrays and scalars serialize natively in C."""
+    def render(self, content) -> bytes:
+        return orjson.dumps(content, option=ORJSON_OPTIONS)
+
+app = FastAPI(title="XAnalyzer Reliability Backend", default_response_class=ORJSONResponse)
 
 # CORS middleware
 app.add_middleware(
@@ -134,20 +157,79 @@ app.add_middleware(
 # This avoids PyTorch 2.6 weights_only loading issues at startup
 model = None
 
+# Run inference in FP16 (only on CUDA; set by get_model)
+model_half = False
+
+# Guards the lazy load so concurrent first requests (or startup warmup) load the model once
+_model_lock = threading.Lock()
+
+# Inference size and confidence. Person boxes for occlusion scoring hold up at 480 on CPU
+# (~44% fewer activations than 640); CUDA keeps 640. conf=0.35 (default 0.25) drops weak
+# boxes before NMS and tracking. YOLO_CPU_IMGSZ=640 restores the old CPU behavior.
+YOLO_CPU_IMGSZ = int(os.environ.get('YOLO_CPU_IMGSZ', 480))
+YOLO_CONF = 0.35
+model_imgsz = 640
+
+# YOLO will auto-download yolov8n.pt if it doesn't exist
+YOLO_MODEL_PATH = 'yolov8n.pt'
+
+# Optional: YOLO_INT8_EXPORT=1 exports/loads an OpenVINO INT8 model on CPU-only hosts.
+# Needs the openvino + nncf packages; the one-time export downloads coco128 for calibration.
+OPENVINO_INT8_DIR = 'yolov8n_int8_openvino_model'
+
+def load_openvino_int8(model_path: str):
+    """Load the cached OpenVINO INT8 export of model_path, exporting it on first use."""
+    if not os.path.isdir(OPENVINO_INT8_DIR):
+        print("[Backend] Exporting YOLOv8n to OpenVINO INT8 (one-time)...", file=sys.stderr)
+        exported_path = YOLO(model_path).export(format='openvino', int8=True, data='coco128.yaml',
+                                                imgsz=YOLO_CPU_IMGSZ)
+        if os.path.normpath(exported_path) != os.path.normpath(OPENVINO_INT8_DIR):
+            shutil.move(exported_path, OPENVINO_INT8_DIR)
+    return YOLO(OPENVINO_INT8_DIR, task='detect')
+
+def detector_config() -> Tuple:
+    """Detector settings that change analysis results (part of the result cache key)."""
+    cuda = torch is not None and torch.cuda.is_available()
+    weights_size = os.path.getsize(YOLO_MODEL_PATH) if os.path.exists(YOLO_MODEL_PATH) else None
+    return (
+        YOLO_MODEL_PATH, weights_size,
+        'cuda' if cuda else 'cpu',
+        model_imgsz if cuda else YOLO_CPU_IMGSZ,
+        YOLO_CONF,
+        not cuda and os.environ.get('YOLO_INT8_EXPORT') == '1',
+    )
+
 def get_model():
     """Lazy load YOLO model on first use."""
-    global model
+    global model, model_half, model_imgsz
     if YOLO is None:
         raise ImportError("YOLO (ultralytics) is not available. Please install ultralytics package.")
-    if model is None:
+    if model is not None:
+        return model
+    with _model_lock:
+        if model is not None:
+            return model
         print("[Backend] Loading YOLOv8n model...", file=sys.stderr)
         try:
-            # YOLO will auto-download yolov8n.pt if it doesn't exist
-            model_path = 'yolov8n.pt'
+            model_path = YOLO_MODEL_PATH
             if not os.path.exists(model_path):
                 print("[Backend] Model file not found, YOLO will download it automatically...", file=sys.stderr)
-            model = YOLO(model_path)
-            print("[Backend] YOLOv8n model loaded successfully!", file=sys.stderr)
+            
+            if torch is not None and torch.cuda.is_available():
+                # Person-only detection doesn't need FP32; FP16 halves weight/activation bandwidth
+                model = YOLO(model_path)
+                model_half = True
+            elif os.environ.get('YOLO_INT8_EXPORT') == '1':
+                model_imgsz = YOLO_CPU_IMGSZ
+                try:
+                    model = load_openvino_int8(model_path)
+                except Exception as e:
+                    print(f"[Backend] OpenVINO INT8 export failed, using FP32 model: {e}", file=sys.stderr)
+                    model = YOLO(model_path)
+            else:
+                model = YOLO(model_path)
+                model_imgsz = YOLO_CPU_IMGSZ
+            print(f"[Backend] YOLOv8n model loaded successfully! (half={model_half}, imgsz={model_imgsz})", file=sys.stderr)
         except Exception as e:
             print(f"[Backend] ERROR loading YOLO model: {e}", file=sys.stderr)
             import traceback
@@ -155,12 +237,173 @@ def get_model():
             raise
     return model
 
+def release_gpu_memory():
+    """Return PyTorch's cached CUDA blocks to the driver (no-op on CPU)."""
+    if torch is not None and torch.cuda.is_available():
+        torch.cuda.empty_cache()
+
+def warm_model_sync():
+    """Preload YOLO and run one dummy inference so the first request skips load + autotune latency."""
+    if YOLO is None:
+        return
+    try:
+        yolo_model = get_model()
+        dummy = np.zeros((640, 640, 3), dtype=np.uint8)
+        yolo_model(dummy, classes=[0], verbose=False, half=model_half, imgsz=model_imgsz, conf=YOLO_CONF)
+        print(f"[Backend] YOLOv8n model warmed up (pid {os.getpid()})", file=sys.stderr)
+    except Exception as e:
+        # Keep serving; get_model() will retry on the first request
+        print(f"[Backend] Warning: model warmup failed: {e}", file=sys.stderr)
+
+# Optional process pool for uploaded-video analysis (ANALYSIS_WORKERS > 0). Each worker loads
+# its own YOLO model, so memory grows with the worker count; 0 keeps analysis in-process.
+ANALYSIS_WORKERS = int(os.environ.get('ANALYSIS_WORKERS', 0))
+_analysis_pool: Optional[ProcessPoolExecutor] = None
+
+def _init_analysis_worker(num_threads: int):
+    # Split the cores between workers instead of every worker's torch/OpenCV grabbing all of them
+    if torch is not None:
+        torch.set_num_threads(num_threads)
+    cv2.setNumThreads(num_threads)
+    warm_model_sync()
+
+def _start_analysis_pool():
+    global _analysis_pool
+    num_threads = max(1, (os.cpu_count() or 1) // ANALYSIS_WORKERS)
+    # spawn: forking a process that already loaded torch/OpenMP is unsafe
+    _analysis_pool = ProcessPoolExecutor(
+        max_workers=ANALYSIS_WORKERS,
+        mp_context=multiprocessing.get_context('spawn'),
+        initializer=_init_analysis_worker,
+        initargs=(num_threads,),
+    )
+    # Start the workers (and their model warm-up) now rather than on the first upload
+    _analysis_pool.submit(os.getpid)
+    print(f"[Backend] Analysis process pool: {ANALYSIS_WORKERS} workers x {num_threads} threads", file=sys.stderr)
+
+def _replace_broken_pool(broken: ProcessPoolExecutor):
+    """Swap in a fresh pool after a worker died (e.g. OOM-killed); later uploads use it."""
+    if _analysis_pool is not broken:
+        return  # Another request already replaced it
+    print("[Backend] Warning: analysis worker died, restarting process pool", file=sys.stderr)
+    broken.shutdown(wait=False, cancel_futures=True)
+    _start_analysis_pool()
+
+@app.on_event("startup")
+async def warm_model():
+    if ANALYSIS_WORKERS > 0:
+        _start_analysis_pool()
+    # The serving process still runs RTSP analyses (frames are already in memory)
+    await asyncio.to_thread(warm_model_sync)
+
+@app.on_event("shutdown")
+async def shutdown_analysis_pool():
+    if _analysis_pool is not None:
+        _analysis_pool.shutdown(wait=False, cancel_futures=True)
+
 # Default Region of Interest (full screen) - [x1, y1, x2, y2] as percentage
 DEFAULT_ROI = [0, 0, 1, 1]
 
-def extract_frames_ffmpeg(video_path: str, fps: float = 5) -> List[Tuple[float, np.ndarray]]:
+def probe_video(video_path: str) -> Tuple[int, int, float]:
+    """
+    Probe video stream dimensions and duration with ffprobe.
+    Returns (width, height, duration_s) of the frames ffmpeg will output.
+    """
+    result = subprocess.run(
+        ['ffprobe', '-v', 'quiet', '-print_format', 'json', '-show_streams',
+         '-select_streams', 'v:0', video_path],
+        capture_output=True, text=True, timeout=30
+    )
+    streams = json.loads(result.stdout or '{}').get('streams', [])
+    if result.returncode != 0 or not streams:
+        raise ValueError(f"Could not open video: {video_path}")
+    
+    stream = streams[0]
+    width, height = int(stream['width']), int(stream['height'])
+    duration = float(stream.get('duration') or 0)
+    
+    # ffmpeg auto-rotates phone videos, so output frames are transposed
+    rotation = stream.get('tags', {}).get('rotate')
+    for side_data in stream.get('side_data_list', []):
+        if 'rotation' in side_data:
+            rotation = side_data['rotation']
+    if rotation is not None and abs(int(float(rotation))) % 180 == 90:
+        width, height = height, width
+    
+    return width, height, duration
+
+def probe_image_size(content: bytes) -> Optional[Tuple[int, int]]:
+    """
+    Return (width, height) of an encoded image, or None if it can't be decoded.
+    PIL parses only the header; the pixel data is never decoded.
+    """
+    if Image is not None:
+        try:
+            with Image.open(io.BytesIO(content)) as img:
+                width, height = img.size
+                # EXIF orientations 5-8 are transposed (matches cv2.imdecode auto-rotation)
+                if img.getexif().get(0x0112, 1) in (5, 6, 7, 8):
+                    width, height = height, width
+                return width, height
+        except Exception:
+            pass
+    
+    img = cv2.imdecode(np.frombuffer(content, np.uint8), cv2.IMREAD_COLOR)
+    if img is None:
+        return None
+    return img.shape[1], img.shape[0]
+
+# Seconds to wait for ffmpeg to exit once its stdout hits EOF
+FFMPEG_EXIT_TIMEOUT_S = 30
+
+def iter_frames_ffmpeg(video_path: str, fps: float = 5):
+    """
+    Decode video through a single ffmpeg process at specified fps.
+    The fps filter drops frames inside ffmpeg, and raw BGR frames are read from the pipe
+    straight into numpy arrays (no intermediate bytes objects).
+    Yields (timestamp, frame) tuples.
+    """
+    width, height = probe_video(video_path)[:2]
+    frame_size = width * height * 3
+    
+    # stderr goes to a temp file, not a pipe: nothing reads it while frames stream, and a full
+    # pipe (one warning per frame on a damaged input) would block ffmpeg and hang the read
+    stderr_file = tempfile.TemporaryFile()
+    proc = subprocess.Popen(
+        ['ffmpeg', '-nostdin', '-i', video_path, '-vf', f'fps={fps}', '-an', '-sn',
+         '-f', 'rawvideo', '-pix_fmt', 'bgr24', '-loglevel', 'error', 'pipe:1'],
+        stdout=subprocess.PIPE, stderr=stderr_file, bufsize=10**8
+    )
+    
+    try:
+        frame_idx = 0
+        while True:
+            frame = np.empty((height, width, 3), dtype=np.uint8)
+            n = proc.stdout.readinto(memoryview(frame).cast('B'))
+            if n < frame_size:
+                break  # EOF (or truncated last frame)
+            yield frame_idx / fps, frame
+            frame_idx += 1
+        
+        try:
+            proc.wait(timeout=FFMPEG_EXIT_TIMEOUT_S)
+        except subprocess.TimeoutExpired:
+            raise ValueError(f"ffmpeg did not exit within {FFMPEG_EXIT_TIMEOUT_S}s")
+        if proc.returncode != 0 and frame_idx == 0:
+            stderr_file.seek(0)
+            error = stderr_file.read().decode('utf-8', errors='replace').strip()
+            raise ValueError(f"ffmpeg failed to decode video: {error}")
+    finally:
+        if proc.poll() is None:
+            proc.kill()
+            proc.wait()
+        proc.stdout.close()
+        stderr_file.close()
+
+def extract_frames_opencv(video_path: str, fps: float = 5) -> List[Tuple[float, np.ndarray]]:
     """
     Extract frames from video using OpenCV at specified fps.
+    Fallback for hosts without ffmpeg; decodes every frame and keeps every Nth.
     Returns list of (timestamp, frame) tuples.
     """
     frames = []
@@ -189,24 +432,61 @@ def extract_frames_ffmpeg(video_path: str, fps: float = 5) -> List[Tuple[float,
     
     cap.release()
     
-    if not frames:
-        raise ValueError("No frames extracted from video")
-    
     return frames
 
-def calculate_blur_score(frame: np.ndarray) -> float:
+def iter_video_frames(video_path: str, fps: float = 5):
     """
-    Calculate blur score using variance of Laplacian.
+    Iterate (timestamp, frame) tuples from a video file at specified fps.
+    Uses the piped ffmpeg decoder, falling back to OpenCV when ffmpeg/ffprobe are not installed.
+    """
+    if shutil.which('ffmpeg') and shutil.which('ffprobe'):
+        return iter_frames_ffmpeg(video_path, fps)
+    return iter(extract_frames_opencv(video_path, fps))
+
+# Width of the downscaled grayscale frame used for motion gating. Blur is NOT scored on it
+# (the downscale factor varies with source resolution and would skew blur scores) but on
+# the full-resolution gray it is resized from
+ANALYSIS_WIDTH = 640
+
+# Per-thread scratch buffers for blur scoring (it runs on pipeline worker threads)
+_blur_buffers = threading.local()
+
+def prepare_gray(frame: np.ndarray) -> Tuple[np.ndarray, np.ndarray, float]:
+    """
+    Convert frame to grayscale once, then downscale that gray to ANALYSIS_WIDTH (aspect
+    ratio preserved) for motion gating.
+    Returns (full_gray, gray, scale) where scale is the linear downscale factor of gray.
+    """
+    full_gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+    h, w = full_gray.shape
+    scale = min(1.0, ANALYSIS_WIDTH / w)
+    if scale < 1.0:
+        gray = cv2.resize(full_gray, (ANALYSIS_WIDTH, max(1, round(h * scale))), interpolation=cv2.INTER_AREA)
+    else:
+        gray = full_gray
+    return full_gray, gray, scale
+
+def calculate_blur_score_gray(gray: np.ndarray) -> float:
+    """
+    Calculate blur score using variance of Laplacian on a grayscale frame, in float32.
+    The value depends on the input resolution (downsampling averages away the high-frequency
+    detail it measures), so pass the full-resolution frame: the blur thresholds are calibrated
+    for that.
     Higher value = sharper image.
     """
-    gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
-    laplacian_var = cv2.Laplacian(gray, cv2.CV_64F).var()
-    return laplacian_var
+    bufs = _blur_buffers
+    if getattr(bufs, 'laplacian_shape', None) != gray.shape:
+        bufs.laplacian_shape = gray.shape
+        bufs.laplacian = np.empty(gray.shape, dtype=np.float32)
+    
+    cv2.Laplacian(gray, cv2.CV_32F, dst=bufs.laplacian)
+    _, stddev = cv2.meanStdDev(bufs.laplacian)
+    return float(stddev[0, 0] ** 2)
 
 def calculate_union_area(boxes: List[Tuple[float, float, float, float]], roi: List[float], frame_shape: Tuple[int, int]) -> float:
     """
     Calculate union area of person boxes intersecting ROI using mask union.
-    Creates ROI mask grid (200x200), fills person bbox ∩ ROI regions, calculates filled_pixels/total_pixels.
+    Rasterizes person bbox ∩ ROI regions onto a 200x200 ROI grid, calculates filled_pixels/total_pixels.
     Returns occlusion ratio (0-1). No double counting (union operation).
     """
     if not boxes:
@@ -215,7 +495,7 @@ def calculate_union_area(boxes: List[Tuple[float, float, float, float]], roi: Li
     h, w = frame_shape[:2]
     roi_x1, roi_y1, roi_x2, roi_y2 = roi[0] * w, roi[1] * h, roi[2] * w, roi[3] * h
     
-    # Create ROI mask grid (200x200 for efficiency)
+    # ROI mask grid (200x200 for efficiency)
     grid_size = 200
     roi_width = roi_x2 - roi_x1
     roi_height = roi_y2 - roi_y1
@@ -224,91 +504,118 @@ def calculate_union_area(boxes: List[Tuple[float, float, float, float]], roi: Li
         return 0.0
     
     # Scale factors for grid
-    scale_x = grid_size / roi_width if roi_width > 0 else 1
-    scale_y = grid_size / roi_height if roi_height > 0 else 1
+    scale_x = grid_size / roi_width
+    scale_y = grid_size / roi_height
     
-    # Create union mask grid (all zeros initially)
-    union_mask = np.zeros((grid_size, grid_size), dtype=np.uint8)
+    # All boxes at once: (N, 4) in pixel coordinates
+    px = np.asarray(boxes, dtype=np.float64) * np.array([w, h, w, h], dtype=np.float64)
     
-    for box in boxes:
-        # Convert box to pixel coordinates
-        x1, y1, x2, y2 = box[0] * w, box[1] * h, box[2] * w, box[3] * h
-        
-        # Find intersection with ROI
-        intersect_x1 = max(x1, roi_x1)
-        intersect_y1 = max(y1, roi_y1)
-        intersect_x2 = min(x2, roi_x2)
-        intersect_y2 = min(y2, roi_y2)
-        
-        if intersect_x2 > intersect_x1 and intersect_y2 > intersect_y1:
-            # Convert to grid coordinates
-            grid_x1 = int((intersect_x1 - roi_x1) * scale_x)
-            grid_y1 = int((intersect_y1 - roi_y1) * scale_y)
-            grid_x2 = int((intersect_x2 - roi_x1) * scale_x)
-            grid_y2 = int((intersect_y2 - roi_y1) * scale_y)
-            
-            # Clamp to grid bounds
-            grid_x1 = max(0, min(grid_x1, grid_size - 1))
-            grid_y1 = max(0, min(grid_y1, grid_size - 1))
-            grid_x2 = max(0, min(grid_x2, grid_size))
-            grid_y2 = max(0, min(grid_y2, grid_size))
-            
-            # Fill union mask (no double counting - union operation)
-            union_mask[grid_y1:grid_y2, grid_x1:grid_x2] = 1
+    # Intersection with ROI
+    ix1 = np.maximum(px[:, 0], roi_x1)
+    iy1 = np.maximum(px[:, 1], roi_y1)
+    ix2 = np.minimum(px[:, 2], roi_x2)
+    iy2 = np.minimum(px[:, 3], roi_y2)
+    
+    # Grid coordinates, clamped to grid bounds
+    gx1 = np.clip(((ix1 - roi_x1) * scale_x).astype(np.int32), 0, grid_size - 1)
+    gy1 = np.clip(((iy1 - roi_y1) * scale_y).astype(np.int32), 0, grid_size - 1)
+    gx2 = np.clip(((ix2 - roi_x1) * scale_x).astype(np.int32), 0, grid_size)
+    gy2 = np.clip(((iy2 - roi_y1) * scale_y).astype(np.int32), 0, grid_size)
+    
+    # Keep boxes that actually intersect the ROI and cover at least one grid cell
+    keep = (ix2 > ix1) & (iy2 > iy1) & (gx2 > gx1) & (gy2 > gy1)
+    if not keep.any():
+        return 0.0
+    gx1, gy1, gx2, gy2 = gx1[keep], gy1[keep], gx2[keep], gy2[keep]
+    
+    # Fill each clipped box into one uint8 mask; cv2.rectangle fills are C loops and
+    # include the end pixel, hence the -1 on the exclusive grid bounds
+    union_mask = np.zeros((grid_size, grid_size), dtype=np.uint8)
+    for x1, y1, x2, y2 in zip(gx1.tolist(), gy1.tolist(), (gx2 - 1).tolist(), (gy2 - 1).tolist()):
+        cv2.rectangle(union_mask, (x1, y1), (x2, y2), 1, -1)
     
     # Calculate occluded pixels (union area)
-    filled_pixels = np.sum(union_mask > 0)
+    filled_pixels = cv2.countNonZero(union_mask)
     total_pixels = grid_size * grid_size
     
     # Return occlusion ratio (0-1)
-    occlusion_ratio = filled_pixels / total_pixels if total_pixels > 0 else 0.0
+    occlusion_ratio = filled_pixels / total_pixels
     return min(1.0, max(0.0, occlusion_ratio))
 
-def calculate_box_overlap(box1: Tuple[float, float, float, float], box2: Tuple[float, float, float, float]) -> float:
+def box_iou_matrix(boxes1: np.ndarray, boxes2: np.ndarray) -> np.ndarray:
     """
-    Calculate IoU (Intersection over Union) between two normalized bounding boxes.
-    Returns value between 0 and 1.
+    Calculate pairwise IoU (Intersection over Union) between two sets of normalized boxes.
+    boxes1 is (N, 4), boxes2 is (M, 4) as [x1, y1, x2, y2]; returns (N, M) with values 0-1.
     """
-    x1_1, y1_1, x2_1, y2_1 = box1
-    x1_2, y1_2, x2_2, y2_2 = box2
+    tl = np.maximum(boxes1[:, None, :2], boxes2[None, :, :2])
+    br = np.minimum(boxes1[:, None, 2:], boxes2[None, :, 2:])
+    inter = np.clip(br - tl, 0, None).prod(axis=-1)
     
-    # Calculate intersection
-    inter_x1 = max(x1_1, x1_2)
-    inter_y1 = max(y1_1, y1_2)
-    inter_x2 = min(x2_1, x2_2)
-    inter_y2 = min(y2_1, y2_2)
+    area1 = (boxes1[:, 2] - boxes1[:, 0]) * (boxes1[:, 3] - boxes1[:, 1])
+    area2 = (boxes2[:, 2] - boxes2[:, 0]) * (boxes2[:, 3] - boxes2[:, 1])
+    union = area1[:, None] + area2[None, :] - inter
     
-    if inter_x2 <= inter_x1 or inter_y2 <= inter_y1:
-        return 0.0
-    
-    inter_area = (inter_x2 - inter_x1) * (inter_y2 - inter_y1)
-    
-    # Calculate union
-    box1_area = (x2_1 - x1_1) * (y2_1 - y1_1)
-    box2_area = (x2_2 - x1_2) * (y2_2 - y1_2)
-    union_area = box1_area + box2_area - inter_area
-    
-    if union_area <= 0:
-        return 0.0
-    
-    return inter_area / union_area
+    return np.divide(inter, union, out=np.zeros_like(inter), where=union > 0)
 
-def detect_persons(frame: np.ndarray) -> List[Tuple[float, float, float, float]]:
+def result_to_boxes(result) -> List[Tuple[float, float, float, float]]:
     """
-    Detect persons in frame using YOLOv8n.
-    Returns list of normalized bounding boxes [x1, y1, x2, y2] (0-1 range).
+    Convert a single YOLO result into normalized person boxes.
+    Copies all boxes to host in one transfer instead of once per box.
     """
-    yolo_model = get_model()
-    results = yolo_model(frame, classes=[0], verbose=False)  # class 0 = person
-    boxes = []
-    
-    for result in results:
-        for box in result.boxes:
-            # Get normalized coordinates
-            x1, y1, x2, y2 = box.xyxyn[0].cpu().numpy()
-            boxes.append((float(x1), float(y1), float(x2), float(y2)))
+    xyxyn = result.boxes.xyxyn.cpu().numpy()
+    return [tuple(float(v) for v in box) for box in xyxyn]
+
+def results_to_boxes(results) -> List[List[Tuple[float, float, float, float]]]:
+    """
+    Convert a batch of YOLO results into normalized person boxes per frame.
+    Concatenates the boxes on-device so the whole batch takes one device->host sync.
+    """
+    if torch is None or not results:
+        return [result_to_boxes(result) for result in results]
+    per_frame = [result.boxes.xyxyn for result in results]
+    counts = [boxes.shape[0] for boxes in per_frame]
+    xyxyn = torch.cat(per_frame).cpu().tolist()
+    boxes_per_frame = []
+    start = 0
+    for count in counts:
+        boxes_per_frame.append([tuple(box) for box in xyxyn[start:start + count]])
+        start += count
+    return boxes_per_frame
+
+# all_frames boxes are sent as one integer per box: four normalized coordinates quantized
+# to BOX_PACK_BITS each (x1 in the high bits). 4 x 13 = 52 bits stays exact as a JS number.
+BOX_PACK_BITS = 13
+
+def pack_boxes(boxes_per_frame: List[List[Tuple[float, float, float, float]]]) -> List[np.ndarray]:
+    """Pack every frame's normalized boxes into int64s in one vectorized pass."""
+    counts = [len(boxes) for boxes in boxes_per_frame]
+    flat = [box for boxes in boxes_per_frame for box in boxes]
+    scale = (1 << BOX_PACK_BITS) - 1
+    q = np.rint(np.clip(np.asarray(flat, dtype=np.float64).reshape(-1, 4), 0.0, 1.0) * scale).astype(np.int64)
+    packed = (
+        (q[:, 0] << (3 * BOX_PACK_BITS)) | (q[:, 1] << (2 * BOX_PACK_BITS)) |
+        (q[:, 2] << BOX_PACK_BITS) | q[:, 3]
+    )
+    return np.split(packed, np.cumsum(counts)[:-1]) if counts else []
+
+# Frames per YOLO forward pass. Ultralytics preprocesses a list source as a single
+# batch, so chunking keeps the letterboxed input tensor bounded for long clips.
+YOLO_BATCH_SIZE = 16
+
+def detect_persons_batch(frames: List[np.ndarray]):
+    """
+    Detect persons in many frames with batched YOLOv8n forward passes.
+    Yields one list of normalized boxes per input frame, in input order.
+    """
+    if not frames:
+        return
     
-    return boxes
+    yolo_model = get_model()
+    for start in range(0, len(frames), YOLO_BATCH_SIZE):
+        batch = frames[start:start + YOLO_BATCH_SIZE]
+        results = yolo_model(batch, classes=[0], verbose=False, imgsz=model_imgsz, conf=YOLO_CONF,
+                             half=model_half)
+        yield from results_to_boxes(results)
 
 def draw_overlay(frame: np.ndarray, roi: List[float], person_boxes: List[Tuple[float, float, float, float]], 
                  occlusion_pct: float = 0, dwell_max: float = 0, occlusion_max: float = 0,
@@ -333,42 +640,45 @@ def draw_overlay(frame: np.ndarray, roi: List[float], person_boxes: List[Tuple[f
     cv2.rectangle(overlay, (roi_x1, label_y - text_height - 5), (roi_x1 + text_width + 10, label_y + 5), (0, 0, 0), -1)
     cv2.putText(overlay, label, (roi_x1 + 5, label_y), cv2.FONT_HERSHEY_SIMPLEX, font_scale, (0, 0, 255), thickness)
     
+    # Pixel coordinates for all boxes in one pass (truncated like int()), clamped to the frame
+    px = (np.asarray(person_boxes, dtype=np.float64).reshape(-1, 4) * (w, h, w, h)).astype(np.int32)
+    px[:, :2] = np.maximum(px[:, :2], 0)
+    px[:, 2] = np.minimum(px[:, 2], w)
+    px[:, 3] = np.minimum(px[:, 3], h)
+    visible = (px[:, 2] > px[:, 0]) & (px[:, 3] > px[:, 1])
+    
     # Draw person boxes (green with label)
-    for i, box in enumerate(person_boxes):
-        x1, y1, x2, y2 = int(box[0] * w), int(box[1] * h), int(box[2] * w), int(box[3] * h)
-        x1, y1 = max(0, x1), max(0, y1)
-        x2, y2 = min(w, x2), min(h, y2)
-        if x2 > x1 and y2 > y1:
-            cv2.rectangle(overlay, (x1, y1), (x2, y2), (0, 255, 0), 2)
-            # Add person label
-            person_label = f"Person {i+1}"
-            (p_text_width, p_text_height), _ = cv2.getTextSize(person_label, cv2.FONT_HERSHEY_SIMPLEX, 0.4, 1)
-            cv2.rectangle(overlay, (x1, y1 - p_text_height - 4), (x1 + p_text_width + 4, y1), (0, 255, 0), -1)
-            cv2.putText(overlay, person_label, (x1 + 2, y1 - 2), cv2.FONT_HERSHEY_SIMPLEX, 0.4, (0, 0, 0), 1)
+    for i in np.flatnonzero(visible).tolist():
+        x1, y1, x2, y2 = px[i].tolist()
+        cv2.rectangle(overlay, (x1, y1), (x2, y2), (0, 255, 0), 2)
+        # Add person label
+        person_label = f"Person {i+1}"
+        (p_text_width, p_text_height), _ = cv2.getTextSize(person_label, cv2.FONT_HERSHEY_SIMPLEX, 0.4, 1)
+        cv2.rectangle(overlay, (x1, y1 - p_text_height - 4), (x1 + p_text_width + 4, y1), (0, 255, 0), -1)
+        cv2.putText(overlay, person_label, (x1 + 2, y1 - 2), cv2.FONT_HERSHEY_SIMPLEX, 0.4, (0, 0, 0), 1)
     
     # Draw occluded area inside ROI (union mask with semi-transparent red fill)
     if occlusion_pct > 0:
-        # Create mask for person boxes within ROI
-        roi_mask = np.zeros((h, w), dtype=np.uint8)
-        cv2.rectangle(roi_mask, (roi_x1, roi_y1), (roi_x2, roi_y2), 255, -1)
+        # Mask only spans the ROI (filled rectangles include their end pixel, hence +1),
+        # so box ∩ ROI is drawn directly and no full-frame masks are needed
+        mask_x1, mask_y1 = max(0, roi_x1), max(0, roi_y1)
+        mask_x2, mask_y2 = min(w, roi_x2 + 1), min(h, roi_y2 + 1)
         
-        person_mask = np.zeros((h, w), dtype=np.uint8)
-        for box in person_boxes:
-            x1, y1, x2, y2 = int(box[0] * w), int(box[1] * h), int(box[2] * w), int(box[3] * h)
-            x1, y1 = max(0, x1), max(0, y1)
-            x2, y2 = min(w, x2), min(h, y2)
-            if x2 > x1 and y2 > y1:
-                # Only draw intersection with ROI
-                inter_x1, inter_y1 = max(roi_x1, x1), max(roi_y1, y1)
-                inter_x2, inter_y2 = min(roi_x2, x2), min(roi_y2, y2)
-                if inter_x2 > inter_x1 and inter_y2 > inter_y1:
-                    cv2.rectangle(person_mask, (inter_x1, inter_y1), (inter_x2, inter_y2), 255, -1)
-        
-        # Get union of person boxes within ROI
-        occluded_mask = cv2.bitwise_and(roi_mask, person_mask)
-        
-        # Apply semi-transparent red overlay to occluded area
-        overlay[occluded_mask > 0] = (overlay[occluded_mask > 0] * 0.5 + np.array([0, 0, 255]) * 0.5).astype(np.uint8)
+        if mask_x2 > mask_x1 and mask_y2 > mask_y1:
+            person_mask = np.zeros((mask_y2 - mask_y1, mask_x2 - mask_x1), dtype=np.uint8)
+            # Only draw intersection with ROI, in mask coordinates
+            inter = np.concatenate([np.maximum(px[:, :2], (roi_x1, roi_y1)),
+                                    np.minimum(px[:, 2:], (roi_x2, roi_y2))], axis=1)
+            inter -= np.array([mask_x1, mask_y1, mask_x1, mask_y1], dtype=np.int32)
+            inside = visible & (inter[:, 2] > inter[:, 0]) & (inter[:, 3] > inter[:, 1])
+            for x1, y1, x2, y2 in inter[inside].tolist():
+                cv2.rectangle(person_mask, (x1, y1), (x2, y2), 255, -1)
+            
+            # Apply semi-transparent red overlay to occluded area
+            roi_view = overlay[mask_y1:mask_y2, mask_x1:mask_x2]
+            red = np.full_like(roi_view, (0, 0, 255))
+            blended = cv2.addWeighted(roi_view, 0.5, red, 0.5, 0)
+            np.copyto(roi_view, blended, where=person_mask[:, :, None].astype(bool))
     
     # Add text labels at top-left corner (stacked)
     font = cv2.FONT_HERSHEY_SIMPLEX
@@ -409,8 +719,8 @@ def get_grok_insights(
     reliability_label: str,
     reliability_score: int,
     signals: Dict,
-    alert_frame_base64: Optional[str] = None,
-    overlay_image_base64: Optional[str] = None
+    alert_frame_jpeg: Optional[bytes] = None,
+    overlay_image_jpeg: Optional[bytes] = None
 ) -> Optional[str]:
     """
     Get Grok AI insights for reliability analysis.
@@ -419,8 +729,8 @@ def get_grok_insights(
         reliability_label: 'RELIABLE' or 'NOT RELIABLE'
         reliability_score: Score from 0-100
         signals: Dict with occlusion_pct_avg, occlusion_pct_max, dwell_s_max, blur_score_avg
-        alert_frame_base64: Base64 encoded frame at alert time (optional)
-        overlay_image_base64: Base64 encoded overlay image (optional)
+        alert_frame_jpeg: JPEG bytes of the frame at alert time (optional)
+        overlay_image_jpeg: JPEG bytes of the overlay image (optional)
     
     Returns:
         Grok insights string or None if failed/not configured
@@ -431,8 +741,10 @@ def get_grok_insights(
     
     try:
         # Use alert_frame if available (most relevant), otherwise overlay_image
-        frame_to_analyze = alert_frame_base64 or overlay_image_base64
-        has_frame = bool(frame_to_analyze)
+        frame_jpeg = alert_frame_jpeg or overlay_image_jpeg
+        has_frame = bool(frame_jpeg)
+        # Only the Grok request needs base64; the API response carries raw JPEG blobs
+        frame_to_analyze = base64.b64encode(frame_jpeg).decode('utf-8') if has_frame else None
         
         # Build prompt based on reliability and whether we have a frame
         if has_frame:
@@ -475,7 +787,7 @@ Then provide a SPECIFIC camera placement recommendation based on the occlusion p
                 {
                     "type": "image_url",
                     "image_url": {
-                        "url": f"data:image/png;base64,{frame_to_analyze}",
+                        "url": f"data:image/jpeg;base64,{frame_to_analyze}",
                     },
                 },
             ]
@@ -524,13 +836,538 @@ Then provide a SPECIFIC camera placement recommendation based on the occlusion p
     
     return None
 
-def frame_to_base64(frame: np.ndarray) -> str:
-    """Convert OpenCV frame to base64 PNG string."""
-    _, buffer = cv2.imencode('.png', frame)
-    return base64.b64encode(buffer).decode('utf-8')
+# Overlays are flat graphics + text; 80 is visually identical to 85 and noticeably smaller
+JPEG_QUALITY = 80
+
+def frame_to_jpeg(frame: np.ndarray) -> bytes:
+    """Encode OpenCV frame as JPEG bytes (much faster to encode than PNG)."""
+    ok, buffer = cv2.imencode('.jpg', frame, [cv2.IMWRITE_JPEG_QUALITY, JPEG_QUALITY, cv2.IMWRITE_JPEG_OPTIMIZE, 0])
+    if not ok:
+        raise ValueError("JPEG encoding failed")
+    return buffer.tobytes()  # The single copy: the blob store and cache files need bytes
+
+# Overlay/alert JPEGs are served as short-lived blobs from /frame/{id} instead of being
+# base64-inlined into the JSON body
+FRAME_BLOB_TTL_S = 600
+_frame_blobs: Dict[str, Tuple[float, bytes]] = {}
+_frame_blobs_lock = threading.Lock()
+
+def store_frame_blob(jpeg: bytes, frame_id: Optional[str] = None) -> str:
+    """Keep JPEG bytes in memory for FRAME_BLOB_TTL_S and return the id to fetch them by."""
+    now = time.time()
+    frame_id = frame_id or uuid.uuid4().hex
+    with _frame_blobs_lock:
+        expired = [k for k, (created, _) in _frame_blobs.items() if now - created > FRAME_BLOB_TTL_S]
+        for k in expired:
+            del _frame_blobs[k]
+        _frame_blobs[frame_id] = (now, jpeg)
+    return frame_id
+
+# Response field / header for each image served as a blob
+FRAME_BLOB_FIELDS = {
+    'overlay_image': 'X-Overlay-URL',
+    'alert_frame': 'X-Alert-Frame-URL',
+}
+
+def cached_frame_id(cache_key: str, name: str) -> str:
+    """Stable blob id for a cached result's frame; /frame falls back to the result cache."""
+    return f"{cache_key}.{name}"
+
+def cached_frame_headers(cache_key: str, names) -> Dict[str, str]:
+    return {FRAME_BLOB_FIELDS[name]: f"/frame/{cached_frame_id(cache_key, name)}" for name in names}
+
+def attach_frame_urls(response: Dict, frames: Dict[str, bytes], cache_key: Optional[str] = None) -> Dict[str, str]:
+    """
+    Register each JPEG as a blob and add a '<name>_url' field to response.
+    With cache_key the ids are stable, so the response can be cached verbatim.
+    Returns the matching response headers.
+    """
+    headers = {}
+    for name, jpeg in frames.items():
+        frame_id = cached_frame_id(cache_key, name) if cache_key else None
+        url = f"/frame/{store_frame_blob(jpeg, frame_id)}"
+        response[f"{name}_url"] = url
+        headers[FRAME_BLOB_FIELDS[name]] = url
+    return headers
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+def wants_ndjson(request: Request) -> bool:
+    return NDJSON_MEDIA_TYPE in request.headers.get('accept', '')
+
+def iter_ndjson(response: Dict):
+    """
+    Yield the response as NDJSON: one line with everything except all_frames,
+    then one line per all_frames record, so clients can render before the tail arrives.
+    """
+    all_frames = response.get('all_frames') or []
+    header = {k: v for k, v in response.items() if k != 'all_frames'}
+    header['all_frames_count'] = len(all_frames)
+    yield orjson.dumps(header, option=ORJSON_OPTIONS | orjson.OPT_APPEND_NEWLINE)
+    for record in all_frames:
+        yield orjson.dumps(record, option=ORJSON_OPTIONS | orjson.OPT_APPEND_NEWLINE)
+
+class StreamingFrameStats:
+    """
+    Running occlusion/blur/dwell statistics, fed one detected (non-skipped) frame at a time
+    in frame order. Keeps O(1) state plus the only two frames the overlays need (first
+    early-alert frame and max-occlusion frame) instead of every decoded frame.
+    
+    - dwell: consecutive frames with occlusion > 10%
+    - flip_at_s (early alert): first time occlusion > 30% for >= 0.5s OR dwell >= 2s
+    - standard_ai_alert_at_s: first time occlusion > 60% for >= 2s OR dwell >= 4s
+      NOTE: These thresholds are SIMULATED values representing conservative detection
+      thresholds typical of traditional AI security systems. They are used for comparison
+      purposes to demonstrate XUUG's faster detection capabilities. They are NOT documented
+      industry standards - they are design assumptions for demonstration.
+      If never triggered, reported as clip_duration + 0.1.
+    """
+    
+    def __init__(self, fps: float):
+        self.frame_dwell = 1.0 / fps
+        self.n_detected = 0
+        self.occlusion_sum = 0.0
+        self.occlusion_max = 0.0
+        self.blur_sum = 0.0
+        # Max-occlusion frame; stays at frame 0 (set by the caller) if nothing is occluded
+        self.max_idx = 0
+        self.max_frame: Optional[np.ndarray] = None
+        self.dwell_s_max = 0.0
+        self.dwell_s_total = 0.0
+        self.current_dwell = 0.0
+        self.occlusion30_duration = 0.0
+        self.occlusion60_duration = 0.0
+        self.flip_at_s = 0.0
+        self.alert_idx = -1
+        self.alert_frame: Optional[np.ndarray] = None
+        self.standard_ai_alert_at_s: Optional[float] = None
+    
+    def update(self, frame_idx: int, timestamp: float, frame: np.ndarray,
+               occlusion_pct: float, blur_score: float):
+        self.n_detected += 1
+        self.occlusion_sum += occlusion_pct
+        self.blur_sum += blur_score
+        if occlusion_pct > self.occlusion_max:
+            self.occlusion_max = occlusion_pct
+            self.max_idx = frame_idx
+            self.max_frame = frame
+        
+        # Dwell: consecutive time with occlusion > 10%
+        if occlusion_pct > 10:
+            self.current_dwell += self.frame_dwell
+            self.dwell_s_total += self.frame_dwell
+            self.dwell_s_max = max(self.dwell_s_max, self.current_dwell)
+        else:
+            self.current_dwell = 0.0
+        
+        if occlusion_pct > 30:
+            self.occlusion30_duration += self.frame_dwell
+        else:
+            self.occlusion30_duration = 0.0
+        
+        if occlusion_pct > 60:
+            self.occlusion60_duration += self.frame_dwell
+        else:
+            self.occlusion60_duration = 0.0
+        
+        if self.alert_idx < 0 and (self.occlusion30_duration >= 0.5 or self.current_dwell >= 2.0):
+            self.flip_at_s = timestamp
+            self.alert_idx = frame_idx
+            self.alert_frame = frame
+        
+        # Simulated traditional system
+        if self.standard_ai_alert_at_s is None and (self.occlusion60_duration >= 2.0 or self.current_dwell >= 4.0):
+            self.standard_ai_alert_at_s = timestamp
+    
+    @property
+    def occlusion_avg(self) -> float:
+        return self.occlusion_sum / self.n_detected if self.n_detected else 0
+    
+    @property
+    def blur_avg(self) -> float:
+        return self.blur_sum / self.n_detected if self.n_detected else 0
+
+# Bounded queues between pipeline stages keep at most a few decoded frames in flight
+PIPELINE_QUEUE_SIZE = 8
+UPLOAD_CHUNK_SIZE = 1 << 20  # 1 MiB
+
+async def _decoder(frame_source, q_raw: asyncio.Queue, columns: Dict[str, List]):
+    """Pipeline stage 1: pull decoded frames off the source iterator."""
+    frames_iter = iter(frame_source)
+    idx = 0
+    while True:
+        item = await asyncio.to_thread(next, frames_iter, None)
+        if item is None:
+            break
+        timestamp, frame = item
+        if idx == 0:
+            columns['first_frame'] = frame  # Fallback overlay frame when nothing is occluded
+        columns['timestamp'].append(timestamp)
+        await q_raw.put((idx, timestamp, frame))
+        idx += 1
+    await q_raw.put(None)
+
+async def _gater(q_raw: asyncio.Queue, q_det: asyncio.Queue, motion_detector: MotionDetector,
+                 motion_threshold: float, columns: Dict[str, List]):
+    """Pipeline stage 2: motion gate and blur scoring; forwards motion frames to the detector."""
+    while (item := await q_raw.get()) is not None:
+        idx, timestamp, frame = item
+        # One gray conversion: full resolution for blur, downscaled copy for the motion gate
+        full_gray, gray, scale = await asyncio.to_thread(prepare_gray, frame)
+        has_motion, motion_score = await asyncio.to_thread(motion_detector.has_motion, frame, gray, scale)
+        
+        skipped = not has_motion or motion_score < motion_threshold
+        # Skipped frames keep blur 0 (blur only averages over detected frames)
+        blur_score = 0.0 if skipped else await asyncio.to_thread(calculate_blur_score_gray, full_gray)
+        columns['blur_score'].append(blur_score)
+        columns['motion_score'].append(motion_score)
+        columns['skipped'].append(skipped)
+        # Filled in by the detector for frames that pass the gate
+        columns['person_boxes'].append([])
+        columns['occlusion_pct'].append(0.0)
+        if not skipped:
+            await q_det.put((idx, timestamp, frame, blur_score))
+    await q_det.put(None)
+
+async def _detector(q_det: asyncio.Queue, columns: Dict[str, List], on_detection):
+    """
+    Pipeline stage 3: batched YOLO over whatever motion frames are queued. Results are
+    handed to on_detection in frame order as each batch returns, so frames are not retained.
+    """
+    done = False
+    while not done:
+        batch = []
+        item = await q_det.get()
+        while item is not None:
+            batch.append(item)
+            if len(batch) >= YOLO_BATCH_SIZE or q_det.empty():
+                break
+            item = q_det.get_nowait()
+        done = item is None
+        
+        if batch:
+            frames = [frame for _, _, frame, _ in batch]
+            boxes_per_frame = await asyncio.to_thread(lambda: list(detect_persons_batch(frames)))
+            for (idx, timestamp, frame, blur_score), person_boxes in zip(batch, boxes_per_frame):
+                columns['person_boxes'][idx] = person_boxes
+                columns['occlusion_pct'][idx] = on_detection(idx, timestamp, frame, person_boxes, blur_score)
+
+async def run_detection_pipeline(frame_source, motion_detector: MotionDetector, motion_threshold: float,
+                                 on_detection):
+    """
+    Run decode -> motion/blur gate -> YOLO as overlapping stages connected by bounded queues,
+    so decoding hides behind inference instead of adding to it.
+    on_detection(frame_idx, timestamp, frame, person_boxes, blur_score) is called for each
+    frame that passed the gate, in frame order, and returns its occlusion percentage.
+    Returns (processed_frames, first_frame): per-frame columns (timestamp, blur_score,
+    motion_score, skipped, occlusion_pct as arrays; person_boxes as a list) indexed by frame,
+    and the first decoded frame (None if the source was empty).
+    """
+    columns: Dict[str, List] = {
+        'timestamp': [], 'blur_score': [], 'motion_score': [], 'skipped': [],
+        'person_boxes': [], 'occlusion_pct': [], 'first_frame': None,
+    }
+    q_raw = asyncio.Queue(maxsize=PIPELINE_QUEUE_SIZE)
+    q_det = asyncio.Queue(maxsize=PIPELINE_QUEUE_SIZE)
+    
+    tasks = [
+        asyncio.ensure_future(_decoder(frame_source, q_raw, columns)),
+        asyncio.ensure_future(_gater(q_raw, q_det, motion_detector, motion_threshold, columns)),
+        asyncio.ensure_future(_detector(q_det, columns, on_detection)),
+    ]
+    try:
+        await asyncio.gather(*tasks)
+    finally:
+        # A failed stage would leave the others blocked on their queues
+        for task in tasks:
+            task.cancel()
+    
+    processed_frames = {
+        'timestamp': np.asarray(columns['timestamp'], dtype=np.float64),
+        'blur_score': np.asarray(columns['blur_score'], dtype=np.float64),
+        'motion_score': np.asarray(columns['motion_score'], dtype=np.float64),
+        'skipped': np.asarray(columns['skipped'], dtype=bool),
+        'occlusion_pct': np.asarray(columns['occlusion_pct'], dtype=np.float64),
+        'person_boxes': columns['person_boxes'],
+    }
+    return processed_frames, columns['first_frame']
+
+async def analyze_frames(frame_source, fps: float, roi_coords: List[float]) -> Tuple[Dict, Dict[str, bytes]]:
+    """
+    Analysis core of /analyze-reliability: run the detection pipeline over frame_source and
+    build the response dict plus the overlay/alert JPEGs. Grok insights, caching and frame
+    URLs are left to the caller (they need the serving process's state).
+    """
+    # C) MOTION GATE: Initialize motion detector
+    motion_detector = MotionDetector(threshold=30.0, min_area=500)
+    motion_threshold = 0.5  # Minimum motion score to process frame
+
+    # Tracking state and running statistics, updated as detections stream in
+    stats = StreamingFrameStats(fps)
+    next_track_id = 1
+    # Tracker state as parallel arrays (one row per track) for vectorized matching
+    track_ids = np.empty(0, dtype=np.int64)
+    track_last_boxes = np.empty((0, 4), dtype=np.float64)
+    frame_shape = None
+
+    def process_detection(frame_idx, timestamp, frame, person_boxes, blur_score):
+        nonlocal next_track_id, track_ids, track_last_boxes, frame_shape
+        frame_shape = frame.shape
+
+        # E) TRACKING: Simple overlap-based tracking (assign track IDs)
+        # One IoU matrix per frame against every track's last box
+        det_boxes = np.asarray(person_boxes, dtype=np.float64).reshape(-1, 4)
+        iou = box_iou_matrix(det_boxes, track_last_boxes)
+        used_tracks = np.zeros(len(track_ids), dtype=bool)
+        new_boxes = []
+
+        for i, box in enumerate(person_boxes):
+            # Best unused track above the minimum IoU threshold (0.3)
+            best_row = -1
+            if len(track_ids):
+                overlaps = np.where(used_tracks, -1.0, iou[i])
+                j = int(overlaps.argmax())
+                if overlaps[j] > 0.3:
+                    best_row = j
+
+            if best_row >= 0:
+                # Update existing track
+                track_last_boxes[best_row] = box
+                used_tracks[best_row] = True
+            else:
+                # Create new track
+                new_boxes.append((next_track_id, box))
+                next_track_id += 1
+
+        if new_boxes:
+            track_ids = np.append(track_ids, [track_id for track_id, _ in new_boxes])
+            track_last_boxes = np.vstack([track_last_boxes, [box for _, box in new_boxes]])
+
+        # Calculate occlusion (returns 0-1, convert to percentage)
+        occlusion_ratio = calculate_union_area(person_boxes, roi_coords, frame.shape)
+        occlusion_pct = occlusion_ratio * 100
+
+        stats.update(frame_idx, timestamp, frame, occlusion_pct, blur_score)
+        return occlusion_pct
+
+    # D) DETECTION: Decode, motion-gate and detect as an overlapped pipeline
+    processed_frames, first_frame = await run_detection_pipeline(
+        frame_source, motion_detector, motion_threshold, process_detection
+    )
+    if first_frame is None:
+        raise ValueError("No frames extracted from video")
+    if frame_shape is None:
+        frame_shape = first_frame.shape
+    frame_timestamps = processed_frames['timestamp']
+    skipped_mask = processed_frames['skipped']
+    frames_skipped = int(skipped_mask.sum())
+
+    # Statistics were accumulated while detections streamed in
+    occlusion_pct_avg = stats.occlusion_avg
+    occlusion_pct_max = stats.occlusion_max
+    dwell_s_max = stats.dwell_s_max
+    dwell_s_total = stats.dwell_s_total
+    flip_at_s = stats.flip_at_s
+    alert_frame_index = stats.alert_idx
+    clip_duration = float(frame_timestamps[-1])
+    standard_not_triggered = stats.standard_ai_alert_at_s is None
+    standard_ai_alert_at_s = clip_duration + 0.1 if standard_not_triggered else stats.standard_ai_alert_at_s
+
+    # Per-frame occlusion rounded to 0.1 once for occlusion_series and all_frames
+    occlusion_rounded = np.round(processed_frames['occlusion_pct'], 1)
+
+    # Create occlusion_series for plotting: [(timestamp, occlusion_pct), ...]
+    detected_idx = np.flatnonzero(~skipped_mask)
+    occlusion_series = [
+        {
+            'timestamp': timestamp,
+            'occlusion_pct': occlusion_pct
+        }
+        for timestamp, occlusion_pct in zip(
+            frame_timestamps[detected_idx].tolist(),
+            occlusion_rounded[detected_idx].tolist()
+        )
+    ]
+
+    # Calculate blur score average and normalize to [0,1]
+    blur_score_avg = stats.blur_avg
+    # Normalize blur to blur_term in [0,1] for scoring
+    # Higher blur_score = less blur, so invert: blur_term = 1 - normalized_score
+    # Typical blur_score range: 0-5000, normalize to [0,1] then invert
+    blur_max = 5000.0  # Typical max blur score
+    blur_normalized = min(1.0, blur_score_avg / blur_max) if blur_max > 0 else 0.0
+    blur_term = 1.0 - blur_normalized  # Invert: higher blur_score = lower blur_term
+
+    # Calculate reliability score using coverage metrics
+    coverage_metrics = CoverageMetrics(
+        occlusion_pct_avg=occlusion_pct_avg,
+        occlusion_pct_max=occlusion_pct_max,
+        dwell_s_max=dwell_s_max,
+        blur_score_avg=blur_score_avg,
+        redundancy=0,  # Single camera for now
+        coverage_score=0  # Will calculate below
+    )
+
+    # Calculate coverage score
+    coverage_metrics = replace(coverage_metrics, coverage_score=calculate_coverage_score(coverage_metrics))
+    reliability_score = round(coverage_metrics.coverage_score)
+    reliability_label = 'NOT RELIABLE' if reliability_score < 70 else 'RELIABLE'
+
+    # Generate explanation and action (will be enhanced by Grok if available)
+    occlusion_text = f"{round(occlusion_pct_max)}% occlusion" if occlusion_pct_max > 5 else "minimal occlusion"
+    why = f"Single view with {occlusion_text} means this zone can't be verified independently."
+    # More specific fallback based on occlusion level
+    if occlusion_pct_max > 60:
+        action = "Add second camera opposite the ROI to provide coverage overlap."
+    elif occlusion_pct_max > 30:
+        action = "Reposition camera or add overhead camera to reduce occlusion."
+    else:
+        action = "Consider adding camera redundancy for Region of Interest coverage."
+
+    # Camera recommendation heuristic
+    recommendation = None
+    redundancy = 0  # Single camera for now
+    if occlusion_pct_max > 60 and redundancy == 0:
+        recommendation = "Add second camera opposite ROI"
+    else:
+        # Check if ROI is near top of frame and motion occurs near edge
+        h, w = frame_shape[:2]
+        roi_y1_px = int(roi_coords[1] * h)
+        roi_top_threshold = h * 0.2  # Top 20% of frame
+
+        # Check if any person boxes are near frame edges
+        edge_detected = False
+        for person_boxes in processed_frames['person_boxes']:
+            for box in person_boxes:
+                x1, y1, x2, y2 = box[0] * w, box[1] * h, box[2] * w, box[3] * h
+                # Check if near left/right edges (within 10% of frame width)
+                if x1 < w * 0.1 or x2 > w * 0.9:
+                    edge_detected = True
+                    break
+            if edge_detected:
+                break
+
+        if roi_y1_px < roi_top_threshold and edge_detected:
+            recommendation = "Add rooftop cam / drone check"
+
+    # If no specific recommendation, use default action
+    if not recommendation:
+        recommendation = action
+
+    # Overlay JPEGs, served via /frame/{id}
+    frames_jpeg: Dict[str, bytes] = {}
+
+    # Generate alert frame (frame at flip_at_s)
+    if stats.alert_frame is not None:
+        alert_frame = stats.alert_frame
+        alert_person_boxes = processed_frames['person_boxes'][alert_frame_index]
+        alert_occlusion = float(processed_frames['occlusion_pct'][alert_frame_index])
+        alert_overlay = draw_overlay(
+            alert_frame, 
+            roi_coords, 
+            alert_person_boxes, 
+            alert_occlusion, 
+            dwell_s_max, 
+            occlusion_pct_max,
+            reliability_score,
+            reliability_label
+        )
+        frames_jpeg['alert_frame'] = frame_to_jpeg(alert_overlay)
+
+    # Generate overlay image (frame with max occlusion)
+    if first_frame is not None:
+        max_occlusion_idx = stats.max_idx
+        max_frame = stats.max_frame if stats.max_frame is not None else first_frame
+        max_person_boxes = processed_frames['person_boxes'][max_occlusion_idx]
+        max_occlusion = float(processed_frames['occlusion_pct'][max_occlusion_idx])
+        overlay_frame = draw_overlay(
+            max_frame, 
+            roi_coords, 
+            max_person_boxes, 
+            max_occlusion, 
+            dwell_s_max, 
+            occlusion_pct_max,
+            reliability_score,
+            reliability_label
+        )
+        frames_jpeg['overlay_image'] = frame_to_jpeg(overlay_frame)
+
+    # Round the reported metrics to 0.1 in one vectorized pass
+    (occlusion_avg_r, occlusion_max_r, dwell_max_r, dwell_total_r,
+     flip_at_r, standard_alert_r) = np.round(np.array([
+        occlusion_pct_avg, occlusion_pct_max, dwell_s_max, dwell_s_total,
+        flip_at_s, standard_ai_alert_at_s,
+    ], dtype=np.float64), 1).tolist()
+    blur_avg_r = int(round(blur_score_avg))
+
+    # Prepare response
+    response = {
+        "reliability_label": reliability_label,
+        "reliability_score": reliability_score,
+        "why": why,
+        "action": action,
+        "signals": {
+            "occlusion_pct_avg": occlusion_avg_r,
+            "occlusion_pct_max": occlusion_max_r,
+            "dwell_s_max": dwell_max_r,
+            "dwell_s_total": dwell_total_r,
+            "blur_score_avg": blur_avg_r,
+            "redundancy": 0,
+        },
+        "occlusion_series": occlusion_series,
+        "timestamps": {
+            "flip_at_s": flip_at_r,
+            "standard_ai_alert_at_s": standard_alert_r,
+            "standard_not_triggered": standard_not_triggered,
+        },
+        "debug": {
+            "sampled_frames": len(frame_timestamps),
+            "frames_processed": stats.n_detected,
+            "frames_skipped": frames_skipped,
+            "fps_used": fps,
+            "roi": roi_coords,
+            "roi_pixels": [int(roi_coords[0] * frame_shape[1]), 
+                          int(roi_coords[1] * frame_shape[0]),
+                          int(roi_coords[2] * frame_shape[1]),
+                          int(roi_coords[3] * frame_shape[0])],
+            "motion_gating_enabled": True,
+            "box_pack_bits": BOX_PACK_BITS,
+            "track_count": next_track_id - 1,
+        },
+    }
+
+    if 'alert_frame' in frames_jpeg:
+        # Its boxes are the all_frames record at this timestamp; not repeated here
+        response["frame_data"] = {
+            "timestamp": float(frame_timestamps[alert_frame_index]),
+        }
+
+    # Include all frames data for frontend (boxes packed, see BOX_PACK_BITS)
+    response["all_frames"] = [
+        {
+            "timestamp": timestamp,
+            "person_boxes_packed": packed_boxes,
+            "occlusion_pct": occlusion_pct,
+        }
+        for timestamp, packed_boxes, occlusion_pct in zip(
+            frame_timestamps.tolist(),
+            pack_boxes(processed_frames['person_boxes']),
+            occlusion_rounded.tolist()
+        )
+    ]
+    
+    return response, frames_jpeg
+
+def analyze_video_file(video_path: str, fps: float, roi_coords: List[float]) -> Tuple[Dict, Dict[str, bytes]]:
+    """Synchronous analyze_frames over a video file; the entry point for analysis worker processes."""
+    try:
+        return asyncio.run(analyze_frames(iter_video_frames(video_path, fps), fps, roi_coords))
+    finally:
+        release_gpu_memory()
 
 @app.post("/analyze-reliability")
 async def analyze_reliability(
+    request: Request,
     video: Optional[UploadFile] = File(None),
     rtsp_url: Optional[str] = Form(None),
     fps: Optional[float] = Form(5),
@@ -544,17 +1381,21 @@ async def analyze_reliability(
     Supports:
     - Video file upload (multipart)
     - RTSP stream URL (for live cameras)
+    
+    Responds with NDJSON (summary line, then one line per frame) when the client
+    sends Accept: application/x-ndjson, otherwise a single JSON body.
     """
+    stream_ndjson = wants_ndjson(request)
     try:
         # Validate input: either video file or RTSP URL required
         if not video and not rtsp_url:
-            return JSONResponse(
+            return ORJSONResponse(
                 {"error": "Either 'video' file or 'rtsp_url' must be provided"},
                 status_code=400
             )
         
         if video and rtsp_url:
-            return JSONResponse(
+            return ORJSONResponse(
                 {"error": "Provide either 'video' file OR 'rtsp_url', not both"},
                 status_code=400
             )
@@ -569,16 +1410,20 @@ async def analyze_reliability(
         # A) INGEST: Handle video upload or RTSP stream
         video_path = None
         frames_data: List[Tuple[float, np.ndarray]] = []
+        frame_source = None
+        cache_key = None
         
         if video:
             # Video file upload
+            # Stream to disk in chunks rather than holding the whole upload in memory,
+            # hashing as we go for the result cache
+            hasher = result_cache.new_hasher()
             with tempfile.NamedTemporaryFile(delete=False, suffix='.mp4') as tmp_file:
-                content = await video.read()
-                tmp_file.write(content)
+                while chunk := await video.read(UPLOAD_CHUNK_SIZE):
+                    tmp_file.write(chunk)
+                    hasher.update(chunk)
                 video_path = tmp_file.name
-            
-            # Extract frames from uploaded video
-            frames_data = extract_frames_ffmpeg(video_path, fps)
+            cache_key = result_cache.cache_key(hasher.hexdigest(), fps, roi_coords, detector_config())
             
         elif rtsp_url:
             # RTSP stream
@@ -586,7 +1431,7 @@ async def analyze_reliability(
             
             rtsp_handler = RTSPHandler(rtsp_url)
             if not rtsp_handler.connect():
-                return JSONResponse(
+                return ORJSONResponse(
                     {"error": f"Failed to connect to RTSP stream: {rtsp_url}"},
                     status_code=400
                 )
@@ -597,390 +1442,78 @@ async def analyze_reliability(
             target_frames = int(rtsp_duration * fps)
             
             while (time.time() - start_time) < rtsp_duration and frame_count < target_frames:
-                frame_result = rtsp_handler.read_frame(timeout=2.0)
+                frame_result = await asyncio.to_thread(rtsp_handler.read_frame, 2.0)
                 if frame_result:
                     timestamp, frame = frame_result
                     frames_data.append((timestamp - start_time, frame))  # Relative timestamp
                     frame_count += 1
-                    time.sleep(1.0 / fps)  # Control frame rate
+                    await asyncio.sleep(1.0 / fps)  # Control frame rate
                 else:
                     break
             
-            rtsp_handler.disconnect()
+            # Joins the reader thread (up to the read timeout), so keep it off the event loop
+            await asyncio.to_thread(rtsp_handler.disconnect)
             
             if not frames_data:
-                return JSONResponse(
+                return ORJSONResponse(
                     {"error": "Could not capture frames from RTSP stream"},
                     status_code=400
                 )
-        else:
-            # Video file upload: extract frames
-            if not video_path:
-                return JSONResponse(
-                    {"error": "Video file path not set"},
-                    status_code=400
-                )
-            frames_data = extract_frames_ffmpeg(video_path, fps)
-            if not frames_data:
-                return JSONResponse(
-                    {"error": "Could not extract frames from video"},
-                    status_code=400
-                )
+            frame_source = frames_data
+        
+        assert video_path or frame_source is not None, "no frame source"
         
         try:
-            # C) MOTION GATE: Initialize motion detector
-            motion_detector = MotionDetector(threshold=30.0, min_area=500)
-            motion_threshold = 0.5  # Minimum motion score to process frame
-            frames_skipped = 0
-            
-            # D) DETECTION: Process frames with motion gating
-            processed_frames = []
-            occlusion_pcts = []
-            blur_scores = []
-            track_data = {}  # For simple tracking: {track_id: {boxes, timestamps}}
-            next_track_id = 1
-            
-            for timestamp, frame in frames_data:
-                # Motion gate: Skip frames with no significant motion
-                has_motion, motion_score = motion_detector.has_motion(frame)
-                
-                if not has_motion or motion_score < motion_threshold:
-                    frames_skipped += 1
-                    # Still add frame data but mark as skipped
-                    processed_frames.append({
-                        'timestamp': timestamp,
-                        'person_boxes': [],
-                        'occlusion_pct': 0,
-                        'blur_score': calculate_blur_score(frame),
-                        'motion_score': motion_score,
-                        'skipped': True,
-                    })
-                    continue
-                
-                # Run YOLOv8n person detection (only on frames with motion)
-                person_boxes = detect_persons(frame)
-                
-                # E) TRACKING: Simple overlap-based tracking (assign track IDs)
-                tracked_boxes = []
-                used_tracks = set()
-                
-                for box in person_boxes:
-                    # Find matching track by overlap
-                    best_track_id = None
-                    best_overlap = 0.3  # Minimum IoU threshold
-                    
-                    for track_id, track_info in track_data.items():
-                        if track_id in used_tracks:
-                            continue
-                        # Get last box from this track
-                        if track_info['boxes']:
-                            last_box = track_info['boxes'][-1]
-                            # Calculate IoU (simplified)
-                            overlap = calculate_box_overlap(box, last_box)
-                            if overlap > best_overlap:
-                                best_overlap = overlap
-                                best_track_id = track_id
-                    
-                    if best_track_id:
-                        # Update existing track
-                        track_data[best_track_id]['boxes'].append(box)
-                        track_data[best_track_id]['timestamps'].append(timestamp)
-                        tracked_boxes.append({'box': box, 'track_id': best_track_id})
-                        used_tracks.add(best_track_id)
-                    else:
-                        # Create new track
-                        track_id = next_track_id
-                        next_track_id += 1
-                        track_data[track_id] = {
-                            'boxes': [box],
-                            'timestamps': [timestamp]
-                        }
-                        tracked_boxes.append({'box': box, 'track_id': track_id})
-                
-                # Calculate occlusion (returns 0-1, convert to percentage)
-                occlusion_ratio = calculate_union_area(person_boxes, roi_coords, frame.shape)
-                occlusion_pct = occlusion_ratio * 100
-                occlusion_pcts.append(occlusion_pct)
-                
-                # Calculate blur
-                blur_score = calculate_blur_score(frame)
-                blur_scores.append(blur_score)
-                
-                processed_frames.append({
-                    'timestamp': timestamp,
-                    'person_boxes': person_boxes,
-                    'tracked_boxes': tracked_boxes,
-                    'occlusion_pct': occlusion_pct,
-                    'blur_score': blur_score,
-                    'motion_score': motion_score,
-                    'skipped': False,
-                })
+            # Same clip with the same parameters: skip the pipeline entirely
+            if cache_key:
+                cached = result_cache.get_cached_result(cache_key)
+                if cached is not None:
+                    print(f"[Backend] Result cache hit: {cache_key}", file=sys.stderr)
+                    # Already-encoded JSON (frame URLs included), sent as-is
+                    cached_body, cached_frames = cached
+                    if stream_ndjson:
+                        cached_ndjson = result_cache.get_cached_ndjson(cache_key)
+                        if cached_ndjson is None:
+                            # First NDJSON hit for this entry: encode once, later hits send the bytes
+                            cached_ndjson = b"".join(iter_ndjson(orjson.loads(cached_body)))
+                            result_cache.store_ndjson(cache_key, cached_ndjson)
+                        return Response(content=cached_ndjson, media_type=NDJSON_MEDIA_TYPE,
+                                        headers=cached_frame_headers(cache_key, cached_frames))
+                    return Response(content=cached_body, media_type="application/json",
+                                    headers=cached_frame_headers(cache_key, cached_frames))
             
-            # Calculate statistics
-            occlusion_pct_avg = sum(occlusion_pcts) / len(occlusion_pcts) if occlusion_pcts else 0
-            occlusion_pct_max = max(occlusion_pcts) if occlusion_pcts else 0
-            
-            # Create occlusion_series for plotting: [(timestamp, occlusion_pct), ...]
-            occlusion_series = [
-                {
-                    'timestamp': processed_frames[i]['timestamp'],
-                    'occlusion_pct': occlusion_pcts[i]
-                }
-                for i in range(len(processed_frames))
-                if not processed_frames[i].get('skipped', False) and i < len(occlusion_pcts)
-            ]
-            
-            # Calculate dwell time
-            dwell_s_max = 0
-            dwell_s_total = 0
-            current_dwell = 0
-            for pct in occlusion_pcts:
-                if pct > 10:
-                    frame_dwell = 1 / fps
-                    current_dwell += frame_dwell
-                    dwell_s_total += frame_dwell
-                    dwell_s_max = max(dwell_s_max, current_dwell)
-                else:
-                    current_dwell = 0
-            
-            # Calculate blur score average and normalize to [0,1]
-            blur_score_avg = sum(blur_scores) / len(blur_scores) if blur_scores else 0
-            # Normalize blur to blur_term in [0,1] for scoring
-            # Higher blur_score = less blur, so invert: blur_term = 1 - normalized_score
-            # Typical blur_score range: 0-5000, normalize to [0,1] then invert
-            blur_max = 5000.0  # Typical max blur score
-            blur_normalized = min(1.0, blur_score_avg / blur_max) if blur_max > 0 else 0.0
-            blur_term = 1.0 - blur_normalized  # Invert: higher blur_score = lower blur_term
-            
-            # Calculate flip_at_s (early alert)
-            # flip_at_s: first time occlusion>30 for >=0.5s OR dwell>=2s
-            flip_at_s = 0
-            occlusion30_duration = 0
-            cumulative_dwell = 0
-            alert_frame_index = -1
-            
-            for i, frame_data in enumerate(processed_frames):
-                if frame_data.get('skipped', False):
-                    continue
-                    
-                pct = occlusion_pcts[i] if i < len(occlusion_pcts) else 0
-                frame_time = frame_data['timestamp']
-                
-                # Check occlusion > 30% for >= 0.5s
-                if pct > 30:
-                    occlusion30_duration += 1 / fps
-                    if occlusion30_duration >= 0.5 and flip_at_s == 0:
-                        flip_at_s = frame_time
-                        alert_frame_index = i
-                else:
-                    occlusion30_duration = 0
-                
-                # Check dwell >= 2s
-                if pct > 10:
-                    cumulative_dwell += 1 / fps
-                    if cumulative_dwell >= 2.0 and flip_at_s == 0:
-                        flip_at_s = frame_time
-                        alert_frame_index = i
-                else:
-                    cumulative_dwell = 0
-            
-            # Calculate standard_ai_alert_at_s
-            # NOTE: These thresholds (60% occlusion for 2s, or 4s dwell) are SIMULATED values
-            # representing conservative detection thresholds typical of traditional AI security systems.
-            # They are used for comparison purposes to demonstrate XUUG's faster detection capabilities.
-            # These are NOT documented industry standards - they are design assumptions for demonstration.
-            standard_ai_alert_at_s = 0
-            standard_not_triggered = False
-            cumulative_dwell = 0
-            occlusion60_duration = 0
-            clip_duration = processed_frames[-1]['timestamp'] if processed_frames else 0
-            
-            for i, pct in enumerate(occlusion_pcts):
-                frame_time = processed_frames[i]['timestamp']
-                
-                # Simulated traditional system: Check occlusion > 60% for 2s
-                if pct > 60:
-                    occlusion60_duration += 1 / fps
-                    if occlusion60_duration >= 2 and standard_ai_alert_at_s == 0:
-                        standard_ai_alert_at_s = frame_time
-                else:
-                    occlusion60_duration = 0
-                
-                # Simulated traditional system: Check dwell >= 4s
-                if pct > 10:
-                    cumulative_dwell += 1 / fps
-                    if cumulative_dwell >= 4 and standard_ai_alert_at_s == 0:
-                        standard_ai_alert_at_s = frame_time
-                else:
-                    cumulative_dwell = 0
-            
-            # If not triggered, set to clip_duration + 0.1
-            if standard_ai_alert_at_s == 0:
-                standard_ai_alert_at_s = clip_duration + 0.1
-                standard_not_triggered = True
-            
-            # Calculate reliability score using coverage metrics
-            coverage_metrics = CoverageMetrics(
-                occlusion_pct_avg=occlusion_pct_avg,
-                occlusion_pct_max=occlusion_pct_max,
-                dwell_s_max=dwell_s_max,
-                blur_score_avg=blur_score_avg,
-                redundancy=0,  # Single camera for now
-                coverage_score=0  # Will calculate below
-            )
-            
-            # Calculate coverage score
-            coverage_metrics.coverage_score = calculate_coverage_score(coverage_metrics)
-            reliability_score = round(coverage_metrics.coverage_score)
-            reliability_label = 'NOT RELIABLE' if reliability_score < 70 else 'RELIABLE'
-            
-            # Generate explanation and action (will be enhanced by Grok if available)
-            occlusion_text = f"{round(occlusion_pct_max)}% occlusion" if occlusion_pct_max > 5 else "minimal occlusion"
-            why = f"Single view with {occlusion_text} means this zone can't be verified independently."
-            # More specific fallback based on occlusion level
-            if occlusion_pct_max > 60:
-                action = "Add second camera opposite the ROI to provide coverage overlap."
-            elif occlusion_pct_max > 30:
-                action = "Reposition camera or add overhead camera to reduce occlusion."
-            else:
-                action = "Consider adding camera redundancy for Region of Interest coverage."
-            
-            # Camera recommendation heuristic
-            recommendation = None
-            redundancy = 0  # Single camera for now
-            if occlusion_pct_max > 60 and redundancy == 0:
-                recommendation = "Add second camera opposite ROI"
-            elif frames_data:
-                # Check if ROI is near top of frame and motion occurs near edge
-                h, w = frames_data[0][1].shape[:2]
-                roi_y1_px = int(roi_coords[1] * h)
-                roi_top_threshold = h * 0.2  # Top 20% of frame
-                
-                # Check if any person boxes are near frame edges
-                edge_detected = False
-                for frame_data in processed_frames:
-                    if frame_data.get('skipped', False):
-                        continue
-                    for box in frame_data.get('person_boxes', []):
-                        x1, y1, x2, y2 = box[0] * w, box[1] * h, box[2] * w, box[3] * h
-                        # Check if near left/right edges (within 10% of frame width)
-                        if x1 < w * 0.1 or x2 > w * 0.9:
-                            edge_detected = True
-                            break
-                    if edge_detected:
-                        break
-                
-                if roi_y1_px < roi_top_threshold and edge_detected:
-                    recommendation = "Add rooftop cam / drone check"
-            
-            # If no specific recommendation, use default action
-            if not recommendation:
-                recommendation = action
-            
-            # Generate alert frame (frame at flip_at_s)
-            alert_frame_base64 = None
-            if alert_frame_index >= 0 and alert_frame_index < len(frames_data) and alert_frame_index < len(processed_frames):
-                alert_timestamp, alert_frame = frames_data[alert_frame_index]
-                alert_person_boxes = processed_frames[alert_frame_index]['person_boxes']
-                alert_occlusion = processed_frames[alert_frame_index]['occlusion_pct']
-                alert_overlay = draw_overlay(
-                    alert_frame, 
-                    roi_coords, 
-                    alert_person_boxes, 
-                    alert_occlusion, 
-                    dwell_s_max, 
-                    occlusion_pct_max,
-                    reliability_score,
-                    reliability_label
-                )
-                alert_frame_base64 = frame_to_base64(alert_overlay)
-            
-            # Generate overlay image (frame with max occlusion)
-            overlay_image_base64 = None
-            if processed_frames:
-                max_occlusion_idx = max(range(len(processed_frames)), key=lambda i: processed_frames[i]['occlusion_pct'])
-                max_timestamp, max_frame = frames_data[max_occlusion_idx]
-                max_person_boxes = processed_frames[max_occlusion_idx]['person_boxes']
-                max_occlusion = processed_frames[max_occlusion_idx]['occlusion_pct']
-                overlay_frame = draw_overlay(
-                    max_frame, 
-                    roi_coords, 
-                    max_person_boxes, 
-                    max_occlusion, 
-                    dwell_s_max, 
-                    occlusion_pct_max,
-                    reliability_score,
-                    reliability_label
-                )
-                overlay_image_base64 = frame_to_base64(overlay_frame)
-            
-            # Prepare response
-            response = {
-                "reliability_label": reliability_label,
-                "reliability_score": reliability_score,
-                "why": why,
-                "action": action,
-                "signals": {
-                    "occlusion_pct_avg": round(occlusion_pct_avg * 10) / 10,
-                    "occlusion_pct_max": round(occlusion_pct_max * 10) / 10,
-                    "dwell_s_max": round(dwell_s_max * 10) / 10,
-                    "dwell_s_total": round(dwell_s_total * 10) / 10,
-                    "blur_score_avg": round(blur_score_avg),
-                    "redundancy": 0,
-                },
-                "occlusion_series": occlusion_series,
-                "timestamps": {
-                    "flip_at_s": round(flip_at_s * 10) / 10,
-                    "standard_ai_alert_at_s": round(standard_ai_alert_at_s * 10) / 10,
-                    "standard_not_triggered": standard_not_triggered,
-                },
-                "debug": {
-                    "sampled_frames": len(processed_frames),
-                    "frames_processed": len([f for f in processed_frames if not f.get('skipped', False)]),
-                    "frames_skipped": frames_skipped,
-                    "fps_used": fps,
-                    "roi": roi_coords,
-                    "roi_pixels": [int(roi_coords[0] * frames_data[0][1].shape[1]), 
-                                  int(roi_coords[1] * frames_data[0][1].shape[0]),
-                                  int(roi_coords[2] * frames_data[0][1].shape[1]),
-                                  int(roi_coords[3] * frames_data[0][1].shape[0])] if frames_data else None,
-                    "motion_gating_enabled": True,
-                    "track_count": len(track_data),
-                },
-            }
-            
-            if alert_frame_base64:
-                response["alert_frame"] = alert_frame_base64
-                response["frame_data"] = {
-                    "timestamp": processed_frames[alert_frame_index]['timestamp'],
-                    "person_boxes": processed_frames[alert_frame_index]['person_boxes'],
-                }
-            
-            if overlay_image_base64:
-                response["overlay_image"] = overlay_image_base64
-            
-            # Include all frames data for frontend
-            response["all_frames"] = [
-                {
-                    "timestamp": f['timestamp'],
-                    "person_boxes": f['person_boxes'],
-                    "occlusion_pct": f['occlusion_pct'],
-                }
-                for f in processed_frames
-            ]
+            response = None
+            if video_path and _analysis_pool is not None:
+                # CPU-bound core in a worker process so this event loop stays responsive
+                pool = _analysis_pool
+                try:
+                    response, frames_jpeg = await asyncio.get_running_loop().run_in_executor(
+                        pool, analyze_video_file, video_path, fps, roi_coords
+                    )
+                except BrokenProcessPool:
+                    # Rebuild for later uploads and analyze this one in-process below
+                    _replace_broken_pool(pool)
+            if response is None:
+                if video_path:
+                    # Frames are decoded lazily by the analysis pipeline
+                    frame_source = iter_video_frames(video_path, fps)
+                response, frames_jpeg = await analyze_frames(frame_source, fps, roi_coords)
             
             # Enhance with Grok AI insights if available
-            grok_insights = get_grok_insights(
-                reliability_label=reliability_label,
-                reliability_score=reliability_score,
+            signals = response["signals"]
+            # Blocking HTTP call (up to its 30 s timeout): run it on a worker thread
+            grok_insights = await asyncio.to_thread(
+                get_grok_insights,
+                reliability_label=response["reliability_label"],
+                reliability_score=response["reliability_score"],
                 signals={
-                    "occlusion_pct_avg": round(occlusion_pct_avg * 10) / 10,
-                    "occlusion_pct_max": round(occlusion_pct_max * 10) / 10,
-                    "dwell_s_max": round(dwell_s_max * 10) / 10,
-                    "blur_score_avg": round(blur_score_avg),
+                    "occlusion_pct_avg": signals["occlusion_pct_avg"],
+                    "occlusion_pct_max": signals["occlusion_pct_max"],
+                    "dwell_s_max": signals["dwell_s_max"],
+                    "blur_score_avg": signals["blur_score_avg"],
                 },
-                alert_frame_base64=alert_frame_base64,
-                overlay_image_base64=overlay_image_base64,
+                alert_frame_jpeg=frames_jpeg.get('alert_frame'),
+                overlay_image_jpeg=frames_jpeg.get('overlay_image'),
             )
             
             if grok_insights:
@@ -988,12 +1521,21 @@ async def analyze_reliability(
                 # Optionally enhance why/action from Grok (but keep original as fallback)
                 # For now, just add grok_insights field - frontend can use it
             
-            return JSONResponse(response)
+            headers = attach_frame_urls(response, frames_jpeg, cache_key)
+            
+            if cache_key:
+                result_cache.store_result(cache_key, response, frames_jpeg)
+            
+            if stream_ndjson:
+                return StreamingResponse(iter_ndjson(response), media_type=NDJSON_MEDIA_TYPE, headers=headers)
+            return ORJSONResponse(response, headers=headers)
             
         finally:
             # Clean up temp file
-            if os.path.exists(video_path):
+            if video_path and os.path.exists(video_path):
                 os.unlink(video_path)
+            # Don't let per-request tensors accumulate in the CUDA caching allocator
+            release_gpu_memory()
                 
     except Exception as e:
         import traceback
@@ -1001,7 +1543,7 @@ async def analyze_reliability(
         # Print to stderr so Railway captures it in logs
         print(error_msg, file=sys.stderr)
         print(f"[Backend] Returning 500 error to client", file=sys.stderr)
-        return JSONResponse(
+        return ORJSONResponse(
             {"error": f"Failed to analyze video: {str(e)}"},
             status_code=500
         )
@@ -1031,19 +1573,19 @@ async def calibrate_homography(
         dst_pts_raw = json.loads(target_points)
         
         if not isinstance(src_pts_raw, list) or not isinstance(dst_pts_raw, list):
-            return JSONResponse(
+            return ORJSONResponse(
                 {"error": "source_points and target_points must be JSON arrays"},
                 status_code=400
             )
         
         if len(src_pts_raw) < 4 or len(dst_pts_raw) < 4:
-            return JSONResponse(
+            return ORJSONResponse(
                 {"error": "Need at least 4 point pairs for homography"},
                 status_code=400
             )
         
         if len(src_pts_raw) != len(dst_pts_raw):
-            return JSONResponse(
+            return ORJSONResponse(
                 {"error": "Source and target points must have same length"},
                 status_code=400
             )
@@ -1061,13 +1603,12 @@ async def calibrate_homography(
         src_pts = [to_tuple(pt) for pt in src_pts_raw]
         dst_pts = [to_tuple(pt) for pt in dst_pts_raw]
         
-        # Read frame (for validation, not used in calculation)
+        # Read frame (for validation, not used in calculation) - header probe only
         content = await frame.read()
-        nparr = np.frombuffer(content, np.uint8)
-        img = cv2.imdecode(nparr, cv2.IMREAD_COLOR)
+        image_size = probe_image_size(content)
         
-        if img is None:
-            return JSONResponse(
+        if image_size is None:
+            return ORJSONResponse(
                 {"error": "Could not decode image"},
                 status_code=400
             )
@@ -1077,36 +1618,49 @@ async def calibrate_homography(
         
         # Check if homography calculation failed (returns None)
         if H is None:
-            return JSONResponse(
+            return ORJSONResponse(
                 {"error": "Could not calculate homography. Points may be collinear or invalid. Try selecting 4 non-collinear points."},
                 status_code=400
             )
         
         if not validate_homography(H):
-            return JSONResponse(
+            return ORJSONResponse(
                 {"error": "Invalid homography matrix calculated. Points may be collinear or too close together."},
                 status_code=400
             )
         
-        # Convert to list for JSON serialization
-        H_list = H.tolist()
-        
-        return JSONResponse({
-            "homography_matrix": H_list,
+        # orjson emits the ndarray as nested arrays
+        return ORJSONResponse({
+            "homography_matrix": H,
             "source_points": src_pts,
             "target_points": dst_pts,
-            "image_shape": [img.shape[1], img.shape[0]]  # [width, height]
+            "image_shape": list(image_size)  # [width, height]
         })
         
     except Exception as e:
         import traceback
         error_msg = f"Homography calibration error: {str(e)}\n{traceback.format_exc()}"
         print(error_msg)
-        return JSONResponse(
+        return ORJSONResponse(
             {"error": f"Failed to calculate homography: {str(e)}"},
             status_code=500
         )
 
+@app.get("/frame/{frame_id}")
+async def get_frame(frame_id: str):
+    """Serve an overlay/alert JPEG referenced by an /analyze-reliability response."""
+    with _frame_blobs_lock:
+        blob = _frame_blobs.get(frame_id)
+    if blob is None or time.time() - blob[0] > FRAME_BLOB_TTL_S:
+        # Frames of cached results outlive the in-memory blob TTL
+        key, _, name = frame_id.partition('.')
+        jpeg = result_cache.get_cached_frame(key, name) if name else None
+        if jpeg is None:
+            return ORJSONResponse({"error": "Frame not found or expired"}, status_code=404)
+        blob = (time.time(), jpeg)
+    return Response(content=blob[1], media_type="image/jpeg",
+                    headers={"Cache-Control": f"private, max-age={FRAME_BLOB_TTL_S}"})
+
 @app.get("/health")
 async def health():
     return {"status": "ok"}
@@ -6,12 +6,30 @@ Standardized coverage metric definitions and calculations.
 """
 from typing import Dict, List, Tuple
 from dataclasses import dataclass
+import math
+import numpy as np
 
-@dataclass
+# Optional: numba JIT for the scoring kernel (falls back to pure Python)
+try:
+    from numba import njit
+except ImportError:
+    def njit(*args, **kwargs):
+        return lambda fn: fn
+
+# Redundancy grid: the ROI side is split into this many cells per axis
+REDUNDANCY_GRID_CELLS = 64
+
+@dataclass(frozen=True)
 class CoverageMetrics:
     """
     Standardized coverage metrics for camera reliability.
+    Immutable and slotted (no per-instance __dict__); use dataclasses.replace() to
+    derive an updated copy. orjson serializes it directly as a dataclass.
     """
+    # Manual __slots__ since dataclass(slots=True) needs Python 3.10 (runtime is 3.9)
+    __slots__ = ('occlusion_pct_avg', 'occlusion_pct_max', 'dwell_s_max', 'blur_score_avg',
+                 'redundancy', 'coverage_score')
+    
     occlusion_pct_avg: float
     occlusion_pct_max: float
     dwell_s_max: float
@@ -19,6 +37,15 @@ class CoverageMetrics:
     redundancy: float  # 0-1, coverage overlap with other cameras
     coverage_score: float  # 0-100, overall coverage quality
     
+    # Slots leave no __dict__, so the default unpickling would setattr on a frozen
+    # instance; round-trip the field values explicitly (pickle, copy, process pools)
+    def __getstate__(self) -> Tuple:
+        return tuple(getattr(self, name) for name in self.__slots__)
+    
+    def __setstate__(self, state: Tuple):
+        for name, value in zip(self.__slots__, state):
+            object.__setattr__(self, name, value)
+    
     def to_dict(self) -> Dict:
         """Convert to dictionary for API response."""
         return {
@@ -49,23 +76,21 @@ def calculate_redundancy(
     if not camera1_coverage or not camera2_coverage:
         return 0.0
     
-    # Simple overlap calculation (can be enhanced with proper geometric intersection)
-    # For MVP: approximate overlap as intersection of coverage areas
-    overlap_count = 0
-    total_count = len(camera1_coverage)
-    
-    # Convert to sets for faster lookup (simplified - would need proper geometric intersection)
-    camera2_set = set(camera2_coverage)
-    for point in camera1_coverage:
-        if point in camera2_set:
-            overlap_count += 1
+    # Exact float equality almost never matches across cameras, so quantize points to a
+    # grid (cell = ROI side / REDUNDANCY_GRID_CELLS) and compare cells instead
+    cell = math.sqrt(roi_area) / REDUNDANCY_GRID_CELLS if roi_area > 0 else 1.0
+    keys1 = _grid_keys(np.asarray(camera1_coverage, dtype=np.float64), cell)
+    keys2 = _grid_keys(np.asarray(camera2_coverage, dtype=np.float64), cell)
     
-    if total_count == 0:
-        return 0.0
-    
-    redundancy = overlap_count / total_count
+    # Fraction of camera 1's points whose cell camera 2 also covers
+    redundancy = float(np.isin(keys1, keys2).mean())
     return min(1.0, max(0.0, redundancy))
 
+def _grid_keys(points: np.ndarray, cell: float) -> np.ndarray:
+    """Pack each (x, y) point's grid cell into one int64: (cx << 32) | cy."""
+    cells = np.floor(points.reshape(-1, 2) / cell).astype(np.int64)
+    return (cells[:, 0] << 32) | (cells[:, 1] & 0xFFFFFFFF)
+
 def calculate_coverage_score(metrics: CoverageMetrics) -> float:
     """
     Calculate overall coverage score from metrics.
@@ -76,16 +101,23 @@ def calculate_coverage_score(metrics: CoverageMetrics) -> float:
     Returns:
         Coverage score (0-100)
     """
+    return _coverage_score_core(
+        float(metrics.occlusion_pct_max), float(metrics.dwell_s_max), float(metrics.blur_score_avg)
+    )
+
+@njit(cache=True)
+def _coverage_score_core(occlusion_pct_max, dwell_s_max, blur_score_avg):
     # Normalize occlusion_pct_max (0-100) to 0-1 before weighting
     # risk = 0.6*(occlusion_pct_max/100) + 0.3*min(dwell_s_max/5,1) + 0.1*blur_term
-    occlusion_normalized = metrics.occlusion_pct_max / 100.0  # Normalize 0-100 to 0-1
-    blur_term = max(0, 1 - (metrics.blur_score_avg / 3000))  # Normalize blur (lower = blurrier)
+    occlusion_normalized = occlusion_pct_max / 100.0  # Normalize 0-100 to 0-1
+    blur_term = max(0.0, 1.0 - (blur_score_avg / 3000.0))  # Normalize blur (lower = blurrier)
     
     risk = 0.6 * occlusion_normalized + \
-           0.3 * min(metrics.dwell_s_max / 5.0, 1.0) + \
+           0.3 * min(dwell_s_max / 5.0, 1.0) + \
            0.1 * blur_term
     
     # Clamp score to 0-100 (never negative)
-    score = max(0, min(100, 100 * (1 - risk)))
-    
-    return score
+    return max(0.0, min(100.0, 100.0 * (1.0 - risk)))
+
+# Compile at import so the first request doesn't pay the JIT cost
+_coverage_score_core(0.0, 0.0, 0.0)
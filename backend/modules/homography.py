@@ -32,8 +32,12 @@ def calculate_homography(
     src_pts = np.array(source_points, dtype=np.float32)
     dst_pts = np.array(target_points, dtype=np.float32)
     
-    # Calculate homography using OpenCV
-    H, mask = cv2.findHomography(src_pts, dst_pts, cv2.RANSAC, 5.0)
+    # Hand-clicked points have no outliers to reject, so skip RANSAC:
+    # exactly 4 points -> closed-form solve, more -> least-squares (normalized) DLT
+    if len(source_points) == 4:
+        H = cv2.getPerspectiveTransform(src_pts, dst_pts)
+    else:
+        H, _ = cv2.findHomography(src_pts, dst_pts, 0)
     
     # Check if homography calculation failed
     if H is None:
@@ -41,12 +45,30 @@ def calculate_homography(
     
     return H
 
+def apply_homography_batch(
+    points: np.ndarray,
+    H: np.ndarray
+) -> np.ndarray:
+    """
+    Transform many points using homography matrix in one perspectiveTransform call.
+    
+    Args:
+        points: (N, 2) array of (x, y) points to transform
+        H: 3x3 homography matrix
+        
+    Returns:
+        (N, 2) array of transformed points
+    """
+    pts = np.ascontiguousarray(points, dtype=np.float32).reshape(-1, 1, 2)
+    return cv2.perspectiveTransform(pts, H).reshape(-1, 2)
+
 def apply_homography(
     point: Tuple[float, float],
     H: np.ndarray
 ) -> Tuple[float, float]:
     """
     Transform a point using homography matrix.
+    Prefer apply_homography_batch when transforming several points.
     
     Args:
         point: (x, y) point to transform
@@ -55,10 +77,8 @@ def apply_homography(
     Returns:
         Transformed (x, y) point
     """
-    x, y = point
-    pt = np.array([[x, y]], dtype=np.float32).reshape(-1, 1, 2)
-    transformed = cv2.perspectiveTransform(pt, H)
-    return (float(transformed[0][0][0]), float(transformed[0][0][1]))
+    x, y = apply_homography_batch(np.asarray([point], dtype=np.float32), H)[0]
+    return (float(x), float(y))
 
 def validate_homography(H: np.ndarray) -> bool:
     """
@@ -70,15 +90,20 @@ def validate_homography(H: np.ndarray) -> bool:
     Returns:
         True if valid
     """
-    if H is None or H.shape != (3, 3):
+    if H is None:
+        return False
+    H = np.asarray(H, dtype=np.float64)
+    if H.shape != (3, 3):
         return False
     
-    # Check for NaN or Inf
-    if np.any(np.isnan(H)) or np.any(np.isinf(H)):
+    # Check for NaN or Inf (single fused pass)
+    if not np.isfinite(H).all():
         return False
     
-    # Check determinant (should be non-zero)
-    det = np.linalg.det(H)
+    # Check determinant (should be non-zero).
+    # Closed-form 3x3 cofactor expansion instead of the general LAPACK solver.
+    a, b, c, d, e, f, g, h, i = H.ravel().tolist()
+    det = a * (e * i - f * h) - b * (d * i - f * g) + c * (d * h - e * g)
     if abs(det) < 1e-6:
         return False
     
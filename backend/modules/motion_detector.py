@@ -5,64 +5,138 @@ Extracted/adapted from: PhazerTech/yolo-rtsp-security-cam
 Minimal motion detection to skip frames with no activity.
 Reduces processing load by only analyzing frames with motion.
 """
+import os
 import cv2
 import numpy as np
-from typing import Tuple, Optional
+from typing import Dict, Tuple, Optional
+
+def _opencl_requested() -> bool:
+    """
+    Opt-in OpenCL (T-API) path via MOTION_USE_OPENCL=1. Off by default so results and
+    timings don't depend on which GPU driver the host happens to have.
+    """
+    if os.environ.get('MOTION_USE_OPENCL', '0') != '1':
+        return False
+    try:
+        cv2.ocl.setUseOpenCL(True)
+        return cv2.ocl.haveOpenCL() and cv2.ocl.useOpenCL()
+    except cv2.error:
+        return False
 
 class MotionDetector:
     """
     Simple motion detector using frame differencing.
     """
-    def __init__(self, threshold: float = 30.0, min_area: int = 500):
+    def __init__(self, threshold: float = 30.0, min_area: int = 500, scale: float = 0.25):
         """
         Args:
             threshold: Pixel difference threshold for motion
-            min_area: Minimum area of motion to consider significant
+            min_area: Minimum area of motion to consider significant (original-frame pixels)
+            scale: Linear downscale applied before differencing; a yes/no motion gate
+                   doesn't need full resolution
         """
         self.threshold = threshold
         self.min_area = min_area
-        self.previous_frame: Optional[np.ndarray] = None
+        self.scale = scale
+        self.previous_frame = None  # np.ndarray, or cv2.UMat on the OpenCL path
+        # Run the resize/blur/diff/threshold/dilate chain on cv2.UMat (OpenCL device)
+        self._use_umat = _opencl_requested()
+        self._frame_pixels = 0
+        # One 5x5 rect dilation == the previous two 3x3 (default kernel) iterations, in one pass
+        self._dilate_kernel = cv2.getStructuringElement(cv2.MORPH_RECT, (5, 5))
+        # Reused output buffers, passed to OpenCV as dst= so steady-state frames allocate nothing.
+        # Allocated by the first call (when the shape is known); OpenCV reallocates if it changes.
+        self._buffers: Dict[str, np.ndarray] = {}
+        self._blur_slot = 0  # Blurred frames ping-pong between two buffers (one is previous_frame)
+    
+    def _dst(self, name: str):
+        return self._buffers.get(name)
     
-    def has_motion(self, frame: np.ndarray) -> Tuple[bool, float]:
+    def _keep(self, name: str, out):
+        self._buffers[name] = out
+        return out
+    
+    def has_motion(self, frame: np.ndarray, gray: Optional[np.ndarray] = None,
+                   gray_scale: float = 1.0) -> Tuple[bool, float]:
         """
         Check if frame has significant motion compared to previous frame.
         
         Args:
             frame: Current frame (BGR)
+            gray: Optional grayscale version of frame the caller already computed
+                  (e.g. for blur scoring); skips the BGR->gray pass when given
+            gray_scale: Linear downscale factor of gray relative to frame
             
         Returns:
             (has_motion: bool, motion_score: float)
         """
-        gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
-        gray = cv2.GaussianBlur(gray, (21, 21), 0)
+        if gray is not None:
+            return self.has_motion_gray(gray, gray_scale)
+        if self._use_umat:
+            frame = cv2.UMat(frame)
+        small = self._keep('small_bgr', cv2.resize(frame, (0, 0), fx=self.scale, fy=self.scale,
+                                                   interpolation=cv2.INTER_AREA, dst=self._dst('small_bgr')))
+        gray = self._keep('gray', cv2.cvtColor(small, cv2.COLOR_BGR2GRAY, dst=self._dst('gray')))
+        return self.has_motion_gray(gray, self.scale)
+    
+    def has_motion_gray(self, gray: np.ndarray, scale: float = 1.0) -> Tuple[bool, float]:
+        """
+        Check for motion on an already grayscaled (and optionally downscaled) frame.
+        Lets callers share one gray conversion between motion gating and other per-frame work.
+        
+        Args:
+            gray: Current frame (grayscale), all frames at the same size
+            scale: Linear downscale factor of gray relative to the original frame;
+                   min_area stays in original-frame pixels. Inputs larger than
+                   self.scale are shrunk to it first.
+            
+        Returns:
+            (has_motion: bool, motion_score: float)
+        """
+        if self._use_umat and not isinstance(gray, cv2.UMat):
+            gray = cv2.UMat(gray)
+        
+        if scale > self.scale:
+            f = self.scale / scale
+            gray = self._keep('small', cv2.resize(gray, (0, 0), fx=f, fy=f, interpolation=cv2.INTER_AREA,
+                                                  dst=self._dst('small')))
+            scale = self.scale
+        
+        # Keep the blur footprint constant in original-frame pixels (odd kernel size).
+        # Written into the slot previous_frame doesn't occupy, then the slots swap.
+        ksize = max(3, int(round(21 * scale)) | 1)
+        blur_name = f'blur{self._blur_slot}'
+        gray = self._keep(blur_name, cv2.GaussianBlur(gray, (ksize, ksize), 0, dst=self._dst(blur_name)))
+        self._blur_slot ^= 1
         
         if self.previous_frame is None:
             self.previous_frame = gray
+            # Frame size is fixed per stream; read it once (a device download on the OpenCL path)
+            self._frame_pixels = int(np.prod((gray.get() if isinstance(gray, cv2.UMat) else gray).shape[:2]))
             return False, 0.0
         
         # Calculate frame difference
-        frame_delta = cv2.absdiff(self.previous_frame, gray)
-        thresh = cv2.threshold(frame_delta, self.threshold, 255, cv2.THRESH_BINARY)[1]
-        thresh = cv2.dilate(thresh, None, iterations=2)
+        frame_delta = self._keep('delta', cv2.absdiff(self.previous_frame, gray, dst=self._dst('delta')))
+        thresh = self._keep('thresh', cv2.threshold(frame_delta, self.threshold, 255, cv2.THRESH_BINARY,
+                                                    dst=self._dst('thresh'))[1])
+        thresh = cv2.dilate(thresh, self._dilate_kernel, dst=thresh)
         
-        # Find contours
-        contours, _ = cv2.findContours(thresh.copy(), cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+        # Changed-pixel count instead of contours: the gate only needs "how much moved"
+        # (the only value read back from the device on the OpenCL path)
+        motion_pixels = cv2.countNonZero(thresh)
         
-        # Check for significant motion
-        motion_area = 0
-        for contour in contours:
-            area = cv2.contourArea(contour)
-            if area > self.min_area:
-                motion_area += area
+        # Check for significant motion (area converted back to original-frame pixels)
+        area_scale = 1.0 / (scale * scale)
+        motion_area = motion_pixels * area_scale
         
         # Update previous frame
         self.previous_frame = gray
         
         # Motion score: percentage of frame with motion
-        frame_area = frame.shape[0] * frame.shape[1]
-        motion_score = (motion_area / frame_area) * 100 if frame_area > 0 else 0.0
+        frame_pixels = self._frame_pixels
+        motion_score = (motion_pixels / frame_pixels) * 100 if frame_pixels > 0 else 0.0
         
-        has_motion = motion_area > 0
+        has_motion = motion_area > self.min_area
         
         return has_motion, motion_score
     
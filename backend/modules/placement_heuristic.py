@@ -4,36 +4,22 @@ Extracted/adapted from: Optimization_of_camera_placement
 
 Minimal camera placement recommendation algorithm.
 """
-from typing import List, Tuple, Dict
+from typing import List, Tuple, Dict, Optional
+from functools import lru_cache
 import math
+import numpy as np
 
-def calculate_placement_score(
-    camera_position: Tuple[float, float, float],  # (x, y, height)
-    target_roi: Tuple[float, float, float, float],  # (x1, y1, x2, y2)
-    existing_cameras: List[Tuple[float, float, float]] = None
-) -> Dict[str, float]:
-    """
-    Calculate placement score for a camera position.
-    
-    Args:
-        camera_position: Proposed camera position (x, y, height)
-        target_roi: Target region of interest
-        existing_cameras: List of existing camera positions
-        
-    Returns:
-        Dictionary with score breakdown
-    """
-    if existing_cameras is None:
-        existing_cameras = []
-    
-    # Calculate distance to ROI center
-    roi_center_x = (target_roi[0] + target_roi[2]) / 2
-    roi_center_y = (target_roi[1] + target_roi[3]) / 2
-    
-    distance = math.sqrt(
-        (camera_position[0] - roi_center_x) ** 2 +
-        (camera_position[1] - roi_center_y) ** 2
-    )
+# Optional: numba JIT for the scoring kernel (falls back to pure Python)
+try:
+    from numba import njit
+except ImportError:
+    def njit(*args, **kwargs):
+        return lambda fn: fn
+
+@njit(cache=True)
+def _score_core(cam_x, cam_y, cam_h, roi_center_x, roi_center_y, existing_xy):
+    """Numeric core of calculate_placement_score; existing_xy is an (N, 2) float64 array."""
+    distance = math.sqrt((cam_x - roi_center_x) ** 2 + (cam_y - roi_center_y) ** 2)
     
     # Distance score (closer is better, but not too close)
     optimal_distance = 5.0  # meters
@@ -41,18 +27,15 @@ def calculate_placement_score(
     
     # Height score (higher is generally better for coverage)
     optimal_height = 3.0  # meters
-    height_score = 1.0 / (1.0 + abs(camera_position[2] - optimal_height) / optimal_height)
+    height_score = 1.0 / (1.0 + abs(cam_h - optimal_height) / optimal_height)
     
     # Redundancy score (overlap with existing cameras)
-    redundancy_score = 0.0
-    if existing_cameras:
-        min_distance = min([
-            math.sqrt(
-                (camera_position[0] - cam[0]) ** 2 +
-                (camera_position[1] - cam[1]) ** 2
-            )
-            for cam in existing_cameras
-        ])
+    if existing_xy.shape[0] > 0:
+        min_distance = math.inf
+        for k in range(existing_xy.shape[0]):
+            d = math.sqrt((cam_x - existing_xy[k, 0]) ** 2 + (cam_y - existing_xy[k, 1]) ** 2)
+            if d < min_distance:
+                min_distance = d
         # Some overlap is good, but not too much
         optimal_overlap = 3.0  # meters
         redundancy_score = 1.0 / (1.0 + abs(min_distance - optimal_overlap) / optimal_overlap)
@@ -65,6 +48,45 @@ def calculate_placement_score(
         height_score * 0.3 +
         redundancy_score * 0.3
     )
+    return total_score, distance_score, height_score, redundancy_score
+
+# Compile at import so the first request doesn't pay the JIT cost
+_score_core(0.0, 0.0, 3.0, 0.0, 0.0, np.zeros((1, 2)))
+
+def calculate_placement_score(
+    camera_position: Tuple[float, float, float],  # (x, y, height)
+    target_roi: Tuple[float, float, float, float],  # (x1, y1, x2, y2)
+    existing_cameras: List[Tuple[float, float, float]] = None,
+    roi_center: Optional[Tuple[float, float]] = None
+) -> Dict[str, float]:
+    """
+    Calculate placement score for a camera position.
+    
+    Args:
+        camera_position: Proposed camera position (x, y, height)
+        target_roi: Target region of interest
+        existing_cameras: List of existing camera positions
+        roi_center: Precomputed (x, y) center of target_roi (optional)
+        
+    Returns:
+        Dictionary with score breakdown
+    """
+    if existing_cameras is None:
+        existing_cameras = []
+    
+    # Calculate distance to ROI center
+    if roi_center is None:
+        roi_center = _roi_center(target_roi)
+    roi_center_x, roi_center_y = roi_center
+    
+    # Only x, y are used; cameras may be (x, y) or (x, y, height) tuples
+    existing_xy = np.array(
+        [(cam[0], cam[1]) for cam in existing_cameras], dtype=np.float64
+    ).reshape(-1, 2)
+    total_score, distance_score, height_score, redundancy_score = _score_core(
+        float(camera_position[0]), float(camera_position[1]), float(camera_position[2]),
+        float(roi_center_x), float(roi_center_y), existing_xy
+    )
     
     return {
         "total_score": total_score,
@@ -74,6 +96,19 @@ def calculate_placement_score(
         "recommendation": "GOOD" if total_score > 0.7 else "FAIR" if total_score > 0.5 else "POOR"
     }
 
+def _roi_center(target_roi: Tuple[float, float, float, float]) -> Tuple[float, float]:
+    return ((target_roi[0] + target_roi[2]) / 2, (target_roi[1] + target_roi[3]) / 2)
+
+@lru_cache(maxsize=1024)
+def _score_cached(
+    camera_position: Tuple[float, float, float],
+    target_roi: Tuple[float, float, float, float],
+    existing_cameras: Tuple[Tuple[float, float, float], ...],
+    roi_center: Tuple[float, float]
+) -> Dict[str, float]:
+    # Memoized for UIs that re-query the same ROI + camera set; callers must not mutate the result
+    return calculate_placement_score(camera_position, target_roi, list(existing_cameras), roi_center)
+
 def recommend_placement(
     target_roi: Tuple[float, float, float, float],
     existing_cameras: List[Tuple[float, float, float]] = None,
@@ -90,11 +125,12 @@ def recommend_placement(
     Returns:
         List of scored positions, sorted by score (best first)
     """
+    # ROI center once for all candidates
+    roi_center = _roi_center(target_roi)
+    roi_center_x, roi_center_y = roi_center
+    
     if candidate_positions is None:
         # Generate default candidates around ROI
-        roi_center_x = (target_roi[0] + target_roi[2]) / 2
-        roi_center_y = (target_roi[1] + target_roi[3]) / 2
-        
         candidate_positions = [
             (roi_center_x - 5, roi_center_y, 3.0),
             (roi_center_x + 5, roi_center_y, 3.0),
@@ -103,9 +139,13 @@ def recommend_placement(
             (roi_center_x, roi_center_y, 4.0),  # Higher position
         ]
     
+    # Hashable arguments for the score cache
+    roi_key = tuple(target_roi)
+    cameras_key = tuple(tuple(cam) for cam in existing_cameras) if existing_cameras else ()
+    
     scored_positions = []
     for pos in candidate_positions:
-        score_data = calculate_placement_score(pos, target_roi, existing_cameras)
+        score_data = _score_cached(tuple(pos), roi_key, cameras_key, roi_center)
         scored_positions.append({
             "position": pos,
             **score_data
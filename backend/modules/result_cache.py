@@ -0,0 +1,161 @@
+"""
+Result Cache Module
+
+Caches /analyze-reliability responses keyed by a hash of the uploaded video bytes
+plus the analysis parameters, so resubmitting the same clip skips decoding and
+inference entirely. Entries are a JSON file on disk (expired by mtime, with an
+in-memory LRU of the ready-to-send response bytes in front of the reads), the same
+response encoded as NDJSON once a client first asks for it, plus one JPEG file per
+overlay image.
+"""
+import hashlib
+import json
+import os
+import re
+import tempfile
+import time
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
+
+import orjson
+
+try:
+    from blake3 import blake3 as _blake3
+except ImportError:
+    _blake3 = None
+
+CACHE_DIR = os.environ.get('RESULT_CACHE_DIR', os.path.join(tempfile.gettempdir(), 'xanalyzer_cache'))
+CACHE_TTL_S = float(os.environ.get('RESULT_CACHE_TTL_S', 24 * 3600))
+CACHE_MAX_ENTRIES = 128
+# Bump when analysis code or the response schema changes so older entries stop matching
+CACHE_VERSION = 1
+
+# Cache keys and frame names arrive in /frame/{id} URLs; only these map to files
+_KEY_RE = re.compile(r'[0-9a-f]+_[0-9a-f]+')
+_NAME_RE = re.compile(r'[a-z_]+')
+
+def new_hasher():
+    """Streaming hasher for upload bytes: blake3 when installed, else blake2b."""
+    if _blake3 is not None:
+        return _blake3()
+    return hashlib.blake2b(digest_size=32)
+
+def cache_key(video_digest: str, fps: float, roi: List[float], detector_config: Tuple = ()) -> str:
+    """
+    Cache key for one video + parameter combination (safe to use as a filename).
+    detector_config holds the model/inference settings that change results.
+    """
+    params = json.dumps([CACHE_VERSION, float(fps), [float(v) for v in roi], list(detector_config)])
+    params_digest = hashlib.blake2b(params.encode(), digest_size=8).hexdigest()
+    return f"{video_digest}_{params_digest}"
+
+def _cache_path(key: str) -> str:
+    return os.path.join(CACHE_DIR, f"{key}.json")
+
+def _ndjson_path(key: str) -> str:
+    return os.path.join(CACHE_DIR, f"{key}.ndjson")
+
+def _frame_path(key: str, name: str) -> str:
+    return os.path.join(CACHE_DIR, f"{key}.{name}.jpg")
+
+def _write_atomic(path: str, data: bytes):
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(data)
+    os.replace(tmp_path, path)  # Atomic, so readers never see a partial file
+
+@lru_cache(maxsize=CACHE_MAX_ENTRIES)
+def _read_entry(path: str, mtime: float) -> Tuple[bytes, Tuple[str, ...]]:
+    # mtime is part of the key so a rewritten entry is never served stale
+    with open(path, 'rb') as f:
+        entry = orjson.loads(f.read())
+    # Encoded once per process; later hits just hand the bytes to the response
+    return orjson.dumps(entry['response']), tuple(entry['frames'])
+
+@lru_cache(maxsize=CACHE_MAX_ENTRIES)
+def _read_bytes(path: str, mtime: float) -> bytes:
+    with open(path, 'rb') as f:
+        return f.read()
+
+def get_cached_result(key: str) -> Optional[Tuple[bytes, Tuple[str, ...]]]:
+    """
+    Return (response JSON bytes, frame names) cached for key, or None if missing
+    or expired.
+    """
+    path = _cache_path(key)
+    try:
+        mtime = os.path.getmtime(path)
+        if time.time() - mtime > CACHE_TTL_S:
+            _remove_entry(key)
+            return None
+        return _read_entry(path, mtime)
+    except (OSError, ValueError, KeyError):
+        return None
+
+def get_cached_ndjson(key: str) -> Optional[bytes]:
+    """Return the NDJSON encoding of the response cached for key, or None."""
+    path = _ndjson_path(key)
+    try:
+        mtime = os.path.getmtime(path)
+        if time.time() - mtime > CACHE_TTL_S:
+            return None
+        return _read_bytes(path, mtime)
+    except OSError:
+        return None
+
+def get_cached_frame(key: str, name: str) -> Optional[bytes]:
+    """Return the JPEG cached under key/name, or None."""
+    if not _KEY_RE.fullmatch(key) or not _NAME_RE.fullmatch(name):
+        return None
+    try:
+        with open(_frame_path(key, name), 'rb') as f:
+            return f.read()
+    except OSError:
+        return None
+
+def store_ndjson(key: str, ndjson: bytes):
+    """Attach the NDJSON encoding of an already-cached response to its entry."""
+    try:
+        _write_atomic(_ndjson_path(key), ndjson)
+    except OSError:
+        pass  # Caching is best-effort
+
+def store_result(key: str, response: Dict, frames: Dict[str, bytes]):
+    """
+    Write a response and its JPEG frames to the cache, evicting the oldest entries
+    past CACHE_MAX_ENTRIES. Frame URLs in response should point at
+    get_cached_frame-resolvable ids so a cached hit can be returned verbatim.
+    """
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        # Frames first: the JSON file appearing marks the entry complete
+        for name, jpeg in frames.items():
+            _write_atomic(_frame_path(key, name), jpeg)
+        # Drop an NDJSON form left over from a previous entry under this key
+        if os.path.exists(_ndjson_path(key)):
+            os.unlink(_ndjson_path(key))
+        entry = {'response': response, 'frames': list(frames)}
+        _write_atomic(_cache_path(key), orjson.dumps(entry, option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS))
+        _evict_oldest()
+    except (OSError, TypeError):
+        pass  # Caching is best-effort
+
+def _remove_entry(key: str):
+    for name in os.listdir(CACHE_DIR):
+        if name.startswith(f"{key}."):
+            try:
+                os.unlink(os.path.join(CACHE_DIR, name))
+            except OSError:
+                pass
+
+def _evict_oldest():
+    entries = []
+    for name in os.listdir(CACHE_DIR):
+        if name.endswith('.json'):
+            try:
+                entries.append((os.path.getmtime(os.path.join(CACHE_DIR, name)), name[:-len('.json')]))
+            except OSError:
+                continue
+    entries.sort()
+    for _, key in entries[:max(0, len(entries) - CACHE_MAX_ENTRIES)]:
+        _remove_entry(key)
@@ -6,11 +6,20 @@ Minimal RTSP connection handler for live camera streams.
 """
 import cv2
 from typing import Optional, Tuple
+import threading
 import time
 
+# FFmpeg backend timeouts so a dead camera can't hang open()/read() indefinitely
+RTSP_OPEN_TIMEOUT_MS = 5000
+RTSP_READ_TIMEOUT_MS = 5000
+
 class RTSPHandler:
     """
     Simple RTSP stream handler for camera feeds.
+
+    A daemon reader thread drains the stream continuously and keeps only the
+    newest frame, so read_frame() never returns stale buffered frames and
+    never blocks on (re)connecting.
     """
     def __init__(self, rtsp_url: str, reconnect_delay: int = 5):
         """
@@ -22,59 +31,110 @@ class RTSPHandler:
         self.reconnect_delay = reconnect_delay
         self.cap: Optional[cv2.VideoCapture] = None
         self.last_frame_time = 0
-    
+
+        # Latest-frame slot shared with the reader thread
+        self._latest: Optional[Tuple[float, any]] = None
+        self._latest_seq = 0
+        self._read_seq = 0
+        self._cond = threading.Condition()
+        self._stop = threading.Event()
+        self._reader: Optional[threading.Thread] = None
+
+    def _open(self) -> bool:
+        try:
+            cap = cv2.VideoCapture(self.rtsp_url, cv2.CAP_FFMPEG, [
+                cv2.CAP_PROP_OPEN_TIMEOUT_MSEC, RTSP_OPEN_TIMEOUT_MS,
+                cv2.CAP_PROP_READ_TIMEOUT_MSEC, RTSP_READ_TIMEOUT_MS,
+            ])
+            cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)  # Reduce latency
+            if not cap.isOpened():
+                cap.release()
+                return False
+            self.cap = cap
+            return True
+        except Exception as e:
+            print(f"[RTSP] Connection error: {e}")
+            return False
+
     def connect(self) -> bool:
         """
-        Connect to RTSP stream.
-        
+        Connect to RTSP stream and start the background reader.
+
         Returns:
             True if connected successfully
         """
-        try:
-            self.cap = cv2.VideoCapture(self.rtsp_url)
-            self.cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)  # Reduce latency
-            return self.cap.isOpened()
-        except Exception as e:
-            print(f"[RTSP] Connection error: {e}")
+        if self._reader is not None and self._reader.is_alive():
+            # A reader that is still winding down after disconnect() owns the capture
+            return not self._stop.is_set()
+        if not self._open():
             return False
-    
+        self._stop.clear()
+        self._reader = threading.Thread(target=self._read_loop, name="rtsp-reader", daemon=True)
+        self._reader.start()
+        return True
+
+    def _read_loop(self):
+        """Reader thread: publish every decoded frame, reconnecting on failure."""
+        while not self._stop.is_set():
+            cap = self.cap
+            ret, frame = cap.read() if cap is not None else (False, None)
+            if ret and frame is not None:
+                with self._cond:
+                    self._latest = (time.time(), frame)
+                    self._latest_seq += 1
+                    self._cond.notify_all()
+                continue
+
+            print("[RTSP] Read failed, reconnecting...")
+            if cap is not None:
+                cap.release()
+                self.cap = None
+            while not self._stop.wait(self.reconnect_delay):
+                if self._open():
+                    break
+
+        if self.cap is not None:
+            self.cap.release()
+            self.cap = None
+
     def read_frame(self, timeout: float = 5.0) -> Optional[Tuple[float, any]]:
         """
-        Read a frame from RTSP stream.
-        
+        Return the newest frame not yet returned by a previous call.
+
         Args:
             timeout: Maximum seconds to wait for frame
-            
+
         Returns:
             (timestamp, frame) or None if failed
         """
-        if self.cap is None or not self.cap.isOpened():
+        if self._reader is None or not self._reader.is_alive():
             if not self.connect():
                 return None
-        
-        start_time = time.time()
-        while time.time() - start_time < timeout:
-            ret, frame = self.cap.read()
-            if ret and frame is not None:
-                timestamp = time.time()
-                self.last_frame_time = timestamp
-                return (timestamp, frame)
-            time.sleep(0.1)
-        
-        # Reconnect if timeout
-        print(f"[RTSP] Timeout reading frame, reconnecting...")
-        self.disconnect()
-        if self.connect():
-            return self.read_frame(timeout)
-        
-        return None
-    
+
+        with self._cond:
+            if not self._cond.wait_for(lambda: self._latest_seq > self._read_seq, timeout):
+                return None
+            self._read_seq = self._latest_seq
+            timestamp, frame = self._latest
+        self.last_frame_time = timestamp
+        return (timestamp, frame)
+
     def disconnect(self):
         """Disconnect from RTSP stream."""
-        if self.cap is not None:
+        self._stop.set()
+        if self._reader is not None:
+            self._reader.join(timeout=RTSP_READ_TIMEOUT_MS / 1000 + 1)
+            if self._reader.is_alive():
+                # Still inside cap.read(); the reader releases the capture on exit
+                print("[RTSP] Reader did not stop in time, leaving release to it")
+            else:
+                self._reader = None
+        if self._reader is None and self.cap is not None:
             self.cap.release()
             self.cap = None
-    
+        with self._cond:
+            self._latest = None
+
     def is_connected(self) -> bool:
         """Check if stream is connected."""
         return self.cap is not None and self.cap.isOpened()
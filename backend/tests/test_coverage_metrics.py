@@ -0,0 +1,14 @@
+import copy
+import pickle
+
+from modules.coverage_metrics import CoverageMetrics
+
+
+def test_pickle_and_deepcopy_round_trip():
+    metrics = CoverageMetrics(
+        occlusion_pct_avg=19.4, occlusion_pct_max=26.9, dwell_s_max=5.8,
+        blur_score_avg=42.0, redundancy=0.25, coverage_score=61.0,
+    )
+    assert pickle.loads(pickle.dumps(metrics)) == metrics
+    assert copy.deepcopy(metrics) == metrics
+    assert copy.copy(metrics) == metrics
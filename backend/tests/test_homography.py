@@ -0,0 +1,24 @@
+import numpy as np
+
+from modules.homography import calculate_homography, validate_homography
+
+# The frontend maps 4 clicked pixels onto a 10 m x 10 m ground square
+GROUND_SQUARE = [(0, 0), (10, 0), (10, 10), (0, 10)]
+
+
+def test_accepts_pixel_to_ground_calibrations():
+    quads = {
+        'right_region': [(1280, 200), (1760, 200), (1760, 680), (1280, 680)],
+        'small': [(900, 500), (960, 500), (960, 560), (900, 560)],
+        'perspective': [(500, 400), (1400, 400), (1800, 1000), (100, 1000)],
+    }
+    for name, quad in quads.items():
+        H = calculate_homography(quad, GROUND_SQUARE)
+        assert validate_homography(H), name
+
+
+def test_rejects_degenerate_matrices():
+    assert not validate_homography(None)
+    assert not validate_homography(np.eye(2))
+    assert not validate_homography(np.zeros((3, 3)))
+    assert not validate_homography(np.full((3, 3), np.nan))
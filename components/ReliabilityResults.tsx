@@ -29,21 +29,40 @@ interface ReliabilityData {
     fps_used: number
     roi: [number, number, number, number]
     roi_source?: 'AUTO' | 'USER' // Whether ROI was auto-generated or user-drawn
+    box_pack_bits?: number // Bits per coordinate in all_frames person_boxes_packed
   }
-  overlay_image?: string // base64 PNG with ROI + boxes drawn
+  overlay_image?: string // base64 JPEG with ROI + boxes drawn
   overlay_image_base64?: string // Alternative field name for overlay image
-  alert_frame?: string // base64 PNG of frame at flip_at_s
+  alert_frame?: string // base64 JPEG of frame at flip_at_s
+  overlay_image_url?: string // URL of JPEG with ROI + boxes drawn
+  alert_frame_url?: string // URL of JPEG of frame at flip_at_s
   frame_data?: {
     timestamp: number
-    person_boxes: Array<{ x1: number; y1: number; x2: number; y2: number }>
+    person_boxes?: Array<{ x1: number; y1: number; x2: number; y2: number }> // Local fallback only; backend boxes are in all_frames
   }
   all_frames?: Array<{
     timestamp: number
-    person_boxes: Array<{ x1: number; y1: number; x2: number; y2: number }>
+    person_boxes?: Array<{ x1: number; y1: number; x2: number; y2: number }>
+    person_boxes_packed?: number[] // Backend: one integer per box, see unpackBoxes
     occlusion_pct: number
   }>
 }
 
+// Backend all_frames pack each normalized box into one integer: four quantized
+// coordinates of `bits` bits each, x1 in the highest bits (<= 52 bits, exact in a JS number)
+function unpackBoxes(packed: number[], bits = 13): Array<{ x1: number; y1: number; x2: number; y2: number }> {
+  const base = 2 ** bits
+  const scale = base - 1
+  return packed.map((value) => {
+    const coords = [0, 0, 0, 0]
+    for (let i = 3; i >= 0; i--) {
+      coords[i] = (value % base) / scale
+      value = Math.floor(value / base)
+    }
+    return { x1: coords[0], y1: coords[1], x2: coords[2], y2: coords[3] }
+  })
+}
+
 interface ReliabilityResultsProps {
   data: ReliabilityData | null
   isAnalyzing: boolean
@@ -134,10 +153,11 @@ export default function ReliabilityResults({
     // Find nearest frame
     const frame = findNearestFrame(video.currentTime)
     if (!frame) return
+    const personBoxes = frame.person_boxes ?? unpackBoxes(frame.person_boxes_packed ?? [], data.debug.box_pack_bits)
     
     // Debug: Log person boxes if available (only log occasionally to avoid spam)
-    if (frame.person_boxes && frame.person_boxes.length > 0 && Math.random() < 0.1) {
-      console.log(`[ReliabilityResults] Drawing ${frame.person_boxes.length} person boxes at time ${video.currentTime.toFixed(2)}s`, frame.person_boxes[0])
+    if (personBoxes.length > 0 && Math.random() < 0.1) {
+      console.log(`[ReliabilityResults] Drawing ${personBoxes.length} person boxes at time ${video.currentTime.toFixed(2)}s`, personBoxes[0])
     }
 
     const roi = data.debug.roi
@@ -193,10 +213,10 @@ export default function ReliabilityResults({
     ctx.fillText(labelText, labelX, labelY)
 
     // Draw person boxes (green) - make them more visible
-    if (frame.person_boxes && frame.person_boxes.length > 0) {
+    if (personBoxes.length > 0) {
       ctx.strokeStyle = '#4ade80' // green-400
       ctx.lineWidth = 3 // Increased from 2 to 3 for better visibility
-      frame.person_boxes.forEach((box, idx) => {
+      personBoxes.forEach((box, idx) => {
         // Handle both tuple format [x1, y1, x2, y2] and object format {x1, y1, x2, y2}
         let x1: number, y1: number, x2: number, y2: number
         if (Array.isArray(box)) {
@@ -424,18 +444,21 @@ export default function ReliabilityResults({
   const alertDifference = hasEarlyAlert && hasStandardAlert 
     ? (data.timestamps.standard_ai_alert_at_s - data.timestamps.flip_at_s).toFixed(1)
     : null
+  // Backend results link the overlay JPEG by URL; older/mock results inline it as base64
+  const overlayBase64 = data.overlay_image || data.overlay_image_base64
+  const overlayImageSrc = data.overlay_image_url || (overlayBase64 ? `data:image/jpeg;base64,${overlayBase64}` : undefined)
 
   return (
     <>
       {/* Fullscreen Overlay Zoom Modal */}
-      {overlayZoomed && (data.overlay_image || data.overlay_image_base64) && (
+      {overlayZoomed && overlayImageSrc && (
         <div 
           className="fixed inset-0 bg-black/90 z-50 flex items-center justify-center p-4"
           onClick={() => setOverlayZoomed(false)}
         >
           <div className="relative max-w-7xl max-h-full">
             <img
-              src={`data:image/png;base64,${data.overlay_image || data.overlay_image_base64}`}
+              src={overlayImageSrc}
                           alt="Region of Interest Overlay Fullscreen"
               className="max-w-full max-h-[90vh] object-contain"
             />
@@ -599,11 +622,11 @@ export default function ReliabilityResults({
                         )}
                       </div>
                     </div>
-                  ) : (data.overlay_image || data.overlay_image_base64) ? (
+                  ) : overlayImageSrc ? (
                     <div className="relative rounded-lg overflow-hidden border border-gray-700 bg-gray-900">
                       <div className="relative group cursor-pointer" onClick={() => setOverlayZoomed(true)}>
                         <img
-                          src={`data:image/png;base64,${data.overlay_image || data.overlay_image_base64}`}
+                          src={overlayImageSrc}
                           alt="Region of Interest Overlay with Person Boxes"
                           className="w-full transition-transform group-hover:scale-105"
                         />
@@ -208,6 +208,11 @@ export default function VideoUploaderReliability({
       }
 
       const data = await response.json()
+      // Direct backend responses link overlay JPEGs by backend-relative /frame/{id} paths
+      if (backendUrl) {
+        if (data.overlay_image_url) data.overlay_image_url = `${backendUrl}${data.overlay_image_url}`
+        if (data.alert_frame_url) data.alert_frame_url = `${backendUrl}${data.alert_frame_url}`
+      }
       onAnalysisComplete(data)
     } catch (error) {
       if (error instanceof Error) {